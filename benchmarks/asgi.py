@@ -0,0 +1,189 @@
+"""Compare throughput of the read-only pages under WSGI and ASGI.
+
+Seeds a throwaway SQLite database and serves the feed, category, profile
+and post pages in-process under concurrent load, with the page cache off:
+
+  * wsgi: the class-based views through `WSGIHandler`, one thread per
+    concurrent client;
+  * asgi-sync: the same views through `ASGIHandler` on one event loop;
+  * asgi: the async views of `blog.async_views` through `ASGIHandler`.
+
+    python benchmarks/asgi.py --concurrency 32 --requests 2000
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import reload
+from io import BytesIO
+
+from common import temporary_database
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.test.utils import setup_test_environment
+from django.urls import clear_url_caches
+from django.utils import timezone
+
+from blog import urls as blog_urls
+from blog.models import Post
+from blog.seeding import seed
+from blogicum import urls as root_urls
+
+
+def use_async_views(enabled):
+    settings.BLOG_ASYNC_VIEWS = enabled
+    reload(blog_urls)
+    reload(root_urls)
+    clear_url_caches()
+
+
+def sample_urls():
+    post = Post.objects.filter(
+        is_published=True, category__is_published=True,
+        pub_date__lte=timezone.now()
+    ).select_related('author', 'category').order_by('-comment_count').first()
+    return [
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.pk}/',
+    ]
+
+
+def wsgi_request(handler, url):
+    status = []
+    body = handler({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': BytesIO(),
+    }, lambda code, headers: status.append(code))
+    try:
+        b''.join(body)
+    finally:
+        body.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_request(handler, url):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await handler({
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': url,
+        'query_string': b'',
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+    }, receive, send)
+    return messages[0]['status']
+
+
+def timed(request, *args):
+    started = time.perf_counter()
+    status = request(*args)
+    return status, (time.perf_counter() - started) * 1000
+
+
+async def timed_async(request, *args):
+    started = time.perf_counter()
+    status = await request(*args)
+    return status, (time.perf_counter() - started) * 1000
+
+
+def run_wsgi(urls, args):
+    use_async_views(False)
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        return list(pool.map(
+            lambda i: timed(wsgi_request, handler, urls[i % len(urls)]),
+            range(args.requests)
+        ))
+
+
+async def run_asgi(urls, args):
+    handler = ASGIHandler()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(i):
+        async with semaphore:
+            return await timed_async(
+                asgi_request, handler, urls[i % len(urls)]
+            )
+
+    return await asyncio.gather(*(limited(i) for i in range(args.requests)))
+
+
+def asgi_mode(async_views):
+    def run(urls, args):
+        use_async_views(async_views)
+        return asyncio.run(run_asgi(urls, args))
+    return run
+
+
+MODES = {
+    'wsgi': run_wsgi,
+    'asgi-sync': asgi_mode(False),
+    'asgi': asgi_mode(True),
+}
+
+
+def report(mode, results, elapsed):
+    samples = sorted(sample for _, sample in results)
+    failed = sum(status != 200 for status, _ in results)
+    print(
+        f'{mode:>10}  {len(results) / elapsed:8.1f} req/s'
+        f'  p50 {statistics.median(samples):8.2f} ms'
+        f'  p99 {samples[int(len(samples) * 0.99)]:8.2f} ms'
+        f'  failed {failed}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--comments', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--threads', type=int, default=8,
+                        help='BLOG_ASYNC_THREADS for the async views')
+    parser.add_argument('--mode', choices=MODES, action='append',
+                        help='run only the given modes')
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    logging.disable(logging.WARNING)
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    settings.BLOG_ASYNC_THREADS = args.threads
+    with temporary_database():
+        seed(args.posts, args.comments)
+        urls = sample_urls()
+        connections.close_all()
+        for mode in args.mode or MODES:
+            started = time.perf_counter()
+            results = MODES[mode](urls, args)
+            report(mode, results, time.perf_counter() - started)
+            connections.close_all()
+
+
+if __name__ == '__main__':
+    main()
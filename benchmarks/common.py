@@ -0,0 +1,52 @@
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+if os.environ.get('BLOG_CACHE', 'file') == 'file':
+    os.environ.setdefault('BLOG_CACHE_LOCATION', tempfile.mkdtemp())
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import caches  # noqa: E402
+from django.db import connection  # noqa: E402
+
+
+@contextmanager
+def temporary_database(keep=None):
+    """Run the block against a freshly migrated throwaway SQLite file.
+
+    The caches are cleared as well, so no versions or pages of an earlier
+    database are served.
+    """
+    path = keep or os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.settings_dict['NAME']
+    connection.settings_dict['TEST']['NAME'] = path
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=bool(keep)
+    )
+    for cache in caches.all():
+        cache.clear()
+    try:
+        yield path
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=bool(keep)
+        )
+
+
+def timed(func, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
@@ -0,0 +1,97 @@
+"""EXPLAIN the feed queries with and without the feed indexes.
+
+Seeds a throwaway SQLite database (a million posts by default), then for
+every feed query prints the query plan and median run time, first with the
+indexes from `blog.migrations.0007_feed_indexes` and then with them
+dropped; the indexes are recreated before the script exits.
+
+    python benchmarks/feed_indexes.py --posts 1000000 --comments 200000
+"""
+import argparse
+
+from common import temporary_database, timed
+
+from django.db import connection
+from django.db.models import Q
+
+from blog.models import Category, Comment, Post, User
+from blog.seeding import seed
+from blog.views import filter_published, select_post_cards
+
+FEED_INDEXES = (
+    *((Post, index) for index in Post._meta.indexes),
+    *((Comment, index) for index in Comment._meta.indexes),
+)
+PAGE = 11
+
+
+def feed_queries():
+    category = Category.objects.filter(is_published=True).first()
+    author = User.objects.first()
+    published = select_post_cards(filter_published(Post.objects.all()))
+    middle_offset = published.count() // 2
+    middle = published.values('pub_date', 'pk')[
+        middle_offset:middle_offset + 1
+    ].get()
+    post = Post.objects.order_by('-comment_count').first()
+    return {
+        'index first page': published[:PAGE],
+        'index deep page (keyset)': published.filter(
+            Q(pub_date__lt=middle['pub_date'])
+            | Q(pub_date=middle['pub_date'], pk__lt=middle['pk'])
+        )[:PAGE],
+        'category feed': select_post_cards(
+            filter_published(category.posts.all())
+        )[:PAGE],
+        'author feed (public)': select_post_cards(
+            filter_published(author.posts.all())
+        )[:PAGE],
+        'author feed (own)': select_post_cards(author.posts.all())[:PAGE],
+        'post comments': Comment.objects.filter(post=post).order_by(
+            'created_at', 'pk'
+        )[:50],
+    }
+
+
+def change_indexes(operation):
+    with connection.schema_editor() as editor:
+        for model, index in FEED_INDEXES:
+            getattr(editor, operation)(model, index)
+    # sqlite3 caches prepared statements, which would keep old plans.
+    connection.close()
+
+
+def report(title, queries):
+    print(f'\n=== {title}')
+    for name, queryset in queries.items():
+        print(f'\n-- {name}: {timed(lambda: list(queryset.all())):.2f} ms')
+        print(queryset.explain())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=1000000)
+    parser.add_argument('--comments', type=int, default=200000)
+    parser.add_argument(
+        '--keep', metavar='PATH',
+        help='reuse (or create and keep) the seeded database at PATH'
+    )
+    args = parser.parse_args()
+
+    with temporary_database(args.keep):
+        if not Post.objects.exists():
+            seed(args.posts, args.comments)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        queries = feed_queries()
+        report('with feed indexes', queries)
+        change_indexes('remove_index')
+        try:
+            report('without feed indexes', queries)
+        finally:
+            change_indexes('add_index')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Measure login requests per second on one core for each password hasher.
+
+Creates a user in a throwaway SQLite database and, for every entry of
+`BLOG_PASSWORD_HASHERS` whose library is installed, hashes its password
+with that hasher and posts the login form from a single thread, so the
+rate is what one worker process can serve:
+
+    python benchmarks/login.py --requests 50
+"""
+import argparse
+import logging
+import time
+
+from common import temporary_database
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+
+from blog.models import User
+
+PASSWORD = 'benchmark-Passw0rd'
+
+
+def hashers():
+    for name, path in settings.BLOG_PASSWORD_HASHERS.items():
+        with override_settings(PASSWORD_HASHERS=[path]):
+            hasher = get_hasher()
+            try:
+                hasher.encode(PASSWORD, hasher.salt())
+            except ValueError:
+                print(f'{name:>8}  skipped: library is not installed')
+                continue
+        yield name, path
+
+
+def measure(name, path, user, requests):
+    with override_settings(PASSWORD_HASHERS=[path]):
+        user.set_password(PASSWORD)
+        user.save()
+        client = Client()
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = client.post(settings.LOGIN_URL, {
+                'username': user.username, 'password': PASSWORD
+            })
+            assert response.status_code == 302, response.status_code
+            client.logout()
+        elapsed = time.perf_counter() - started
+    print(
+        f'{name:>8}  {requests / elapsed:7.1f} logins/s'
+        f'  {elapsed / requests * 1000:8.2f} ms per login'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    logging.disable(logging.WARNING)
+    settings.BLOG_AUTH_RATE_LIMITS = {'ip': args.requests * 10,
+                                      'username': args.requests * 10}
+    with temporary_database():
+        user = User.objects.create_user('benchmark')
+        for name, path in hashers():
+            measure(name, path, user, args.requests)
+
+
+if __name__ == '__main__':
+    main()
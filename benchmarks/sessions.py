@@ -0,0 +1,117 @@
+"""Count database reads and writes per request for each session mode.
+
+Seeds a throwaway SQLite database, then for every `BLOG_SESSION_MODE`
+logs in through the login form and browses the profile and post pages,
+printing the queries per request, split into reads, session table reads
+and writes, and the median latency:
+
+    python benchmarks/sessions.py --requests 200
+"""
+import argparse
+import logging
+import statistics
+import time
+
+from common import temporary_database
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from blog.models import Post
+from blog.seeding import seed
+
+SESSION_MODES = ('db', 'cached_db', 'signed_cookies')
+WRITES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+PASSWORD = 'benchmark-password'
+
+
+class QueryCounter:
+    def __init__(self):
+        self.reads = 0
+        self.session_reads = 0
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith(WRITES):
+            self.writes += 1
+        elif 'django_session' in sql:
+            self.session_reads += 1
+        else:
+            self.reads += 1
+        return execute(sql, params, many, context)
+
+
+def measure(request, requests):
+    counter = QueryCounter()
+    samples = []
+    with connection.execute_wrapper(counter):
+        for _ in range(requests):
+            started = time.perf_counter()
+            request()
+            samples.append((time.perf_counter() - started) * 1000)
+    return counter, statistics.median(samples)
+
+
+def run_mode(mode, user, post, requests):
+    settings.SESSION_ENGINE = f'django.contrib.sessions.backends.{mode}'
+    # Drops the sessions and login rate-limit counters of the last mode.
+    cache.clear()
+    client = Client()
+
+    def login():
+        client.logout()
+        response = client.post(settings.LOGIN_URL, {
+            'username': user.username, 'password': PASSWORD
+        })
+        assert response.status_code == 302, response.status_code
+
+    pages = {
+        'login': (login, 5),
+        '/profile/': (lambda: client.get('/profile/'), requests),
+        '/profile/<username>/': (
+            lambda: client.get(f'/profile/{user.username}/'), requests
+        ),
+        '/posts/<id>/': (lambda: client.get(f'/posts/{post.pk}/'), requests),
+    }
+    for page, (request, count) in pages.items():
+        counter, p50 = measure(request, count)
+        print(
+            f'{mode:>15} {page:<22}'
+            f'  reads {counter.reads / count:5.2f}'
+            f'  session reads {counter.session_reads / count:5.2f}'
+            f'  writes {counter.writes / count:5.2f}'
+            f'  p50 {p50:7.2f} ms'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--comments', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=100,
+                        help='timed requests per page and session mode')
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    logging.disable(logging.WARNING)
+    settings.BLOG_AUTH_RATE_LIMITS = {'ip': len(SESSION_MODES) * 10,
+                                      'username': len(SESSION_MODES) * 10}
+    with temporary_database():
+        seed(args.posts, args.comments)
+        post = Post.objects.filter(
+            is_published=True, category__is_published=True,
+            pub_date__lte=timezone.now()
+        ).select_related('author').first()
+        user = post.author
+        user.set_password(PASSWORD)
+        user.save()
+        for mode in SESSION_MODES:
+            run_mode(mode, user, post, args.requests)
+
+
+if __name__ == '__main__':
+    main()
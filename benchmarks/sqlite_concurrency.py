@@ -0,0 +1,122 @@
+"""Compare concurrent read/write throughput of the SQLite profiles.
+
+Seeds a throwaway SQLite database, then for every profile of
+`blog.db.SQLITE_PROFILES` runs reader threads fetching a post page and
+writer threads posting comments to it for a fixed time, and prints the
+number of successful and failed requests and the write latency:
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 4
+"""
+import argparse
+import logging
+import threading
+import time
+
+from common import temporary_database
+
+from django.conf import settings
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from blog.db import SQLITE_PROFILES
+from blog.models import Post, User
+from blog.seeding import seed
+
+
+class Worker(threading.Thread):
+    def __init__(self, request, args, expected_status, deadline):
+        super().__init__()
+        self.request = request
+        self.args = args
+        self.expected_status = expected_status
+        self.deadline = deadline
+        self.done = 0
+        self.failed = 0
+        self.samples = []
+
+    def run(self):
+        try:
+            while time.perf_counter() < self.deadline:
+                started = time.perf_counter()
+                try:
+                    response = self.request(*self.args)
+                    ok = response.status_code == self.expected_status
+                except OperationalError:
+                    ok = False
+                self.samples.append((time.perf_counter() - started) * 1000)
+                if ok:
+                    self.done += 1
+                else:
+                    self.failed += 1
+        finally:
+            connections.close_all()
+
+
+def run_profile(profile, conn_max_age, args, post, author):
+    settings.BLOG_SQLITE_PROFILE = profile
+    connections.databases['default']['CONN_MAX_AGE'] = conn_max_age
+    connections.close_all()
+
+    url = f'/posts/{post.pk}/'
+    deadline = time.perf_counter() + args.seconds
+    readers = [
+        Worker(Client().get, (url,), 200, deadline)
+        for _ in range(args.readers)
+    ]
+    writers = []
+    for _ in range(args.writers):
+        client = Client()
+        client.force_login(author)
+        writers.append(Worker(
+            client.post, (f'{url}comment/', {'text': 'load'}), 302, deadline
+        ))
+    connections.close_all()
+    for worker in readers + writers:
+        worker.start()
+    for worker in readers + writers:
+        worker.join()
+
+    write_samples = sorted(
+        sample for worker in writers for sample in worker.samples
+    )
+    p99 = write_samples[int(len(write_samples) * 0.99)] \
+        if write_samples else 0
+    print(
+        f'{profile:>10} (CONN_MAX_AGE={conn_max_age:>2})'
+        f'  reads {sum(w.done for w in readers) / args.seconds:8.1f}/s'
+        f'  writes {sum(w.done for w in writers) / args.seconds:7.1f}/s'
+        f'  failed {sum(w.failed for w in readers + writers):5}'
+        f'  write p99 {p99:8.2f} ms'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--comments', type=int, default=50000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    logging.disable(logging.WARNING)
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    with temporary_database():
+        seed(args.posts, args.comments)
+        post = Post.objects.filter(
+            is_published=True, category__is_published=True,
+            pub_date__lte=timezone.now()
+        ).first()
+        author = User.objects.first()
+        connection.close()
+        run_profile('rollback', 0, args, post, author)
+        for profile in SQLITE_PROFILES:
+            if profile != 'rollback':
+                run_profile(profile, 60, args, post, author)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""Measure latency, throughput and query counts of every blog URL.
+
+Seeds a throwaway SQLite database, then requests every route of
+`blog/urls.py` through the Django test client, as an anonymous visitor
+where the page is public and as the author of the sampled post, or as a
+staff user for the staff-only pages. Write endpoints are measured last,
+inside a transaction that is rolled back, so a kept database stays the
+same between runs. Each URL reports the queries of a request with an
+empty page cache apart from those of a cached one. Results are written
+as JSON, so runs on different commits can be compared:
+
+    python benchmarks/views.py --posts 1000000 --comments 10000000
+        --users 100000 --keep /tmp/bench.sqlite3 --output before.json
+
+    python benchmarks/views.py --keep /tmp/bench.sqlite3
+        --output after.json --compare before.json
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+from common import ROOT, temporary_database
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import URLPattern, reverse
+
+from blog import urls as blog_urls
+from blog.metrics import QueryTimer
+from blog.models import Category, Comment, Post, User
+from blog.seeding import seed
+
+ANONYMOUS = 'anonymous'
+AUTHOR = 'author'
+STAFF = 'staff'
+LOGIN_REQUIRED = {
+    'edit_profile', 'create_post', 'edit_post', 'delete_post',
+    'add_comment', 'edit_comment', 'delete_comment',
+}
+STAFF_ONLY = {'metrics', 'export'}
+POST_ONLY = {'add_comment'}
+QUERY_PARAMS = {'search': ('q',)}
+
+
+def sample_kwargs():
+    post = Post.objects.filter(
+        is_published=True, category__is_published=True
+    ).order_by('-comment_count').first()
+    comment = Comment.objects.filter(post=post, author=post.author).first()
+    if comment is None:
+        comment = Comment.objects.create(
+            post=post, author=post.author, text='benchmark'
+        )
+    return post.author, {
+        'post_id': post.pk,
+        'comment_id': comment.pk,
+        'username': post.author.username,
+        'category_slug': Category.objects.filter(
+            is_published=True
+        ).values_list('slug', flat=True).first(),
+        'q': post.title.split()[0],
+        'model': 'posts',
+    }
+
+
+def routes(kwargs):
+    for pattern in blog_urls.urlpatterns:
+        if not isinstance(pattern, URLPattern):
+            continue
+        names = pattern.pattern.converters.keys()
+        url = reverse(
+            f'{blog_urls.app_name}:{pattern.name}',
+            kwargs={name: kwargs[name] for name in names}
+        )
+        params = QUERY_PARAMS.get(pattern.name, ())
+        if params:
+            url += '?' + urlencode({name: kwargs[name] for name in params})
+        method = 'post' if pattern.name in POST_ONLY else 'get'
+        if pattern.name in STAFF_ONLY:
+            clients = (STAFF,)
+        elif pattern.name in LOGIN_REQUIRED:
+            clients = (AUTHOR,)
+        else:
+            clients = (ANONYMOUS, AUTHOR)
+        for client in clients:
+            yield f'/{pattern.pattern}', url, method, client
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def fetch(request, url, data):
+    response = request(url, data)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+@contextmanager
+def rolled_back():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def count_queries(request, url, data):
+    queries = QueryTimer()
+    with connection.execute_wrapper(queries):
+        status = fetch(request, url, data).status_code
+    return status, queries.count
+
+
+def measure(client, method, url, requests):
+    data = {'text': 'benchmark'} if method == 'post' else None
+    request = getattr(client, method)
+    caches['pages'].clear()
+    status, miss_queries = count_queries(request, url, data)
+    _, queries = count_queries(request, url, data)
+    samples = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        fetch(request, url, data)
+        samples.append((time.perf_counter() - request_started) * 1000)
+    elapsed = time.perf_counter() - started
+    return {
+        'status': status,
+        'miss_queries': miss_queries,
+        'queries': queries,
+        'rps': requests / elapsed,
+        'mean_ms': statistics.mean(samples),
+        'p50_ms': percentile(samples, 50),
+        'p99_ms': percentile(samples, 99),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+            text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as baseline_file:
+        baseline = {
+            (item['route'], item['client']): item
+            for item in json.load(baseline_file)['results']
+        }
+    print(f'\n=== compared with {baseline_path}')
+    for item in results:
+        old = baseline.get((item['route'], item['client']))
+        if old is None:
+            continue
+        change = (item['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100
+        print(
+            f'{item["route"]:<50} {item["client"]:>9}'
+            f'  p50 {change:+6.1f}%'
+            f'  queries {old["queries"]} -> {item["queries"]}'
+            f'  miss queries {old.get("miss_queries", "-")}'
+            f' -> {item["miss_queries"]}'
+        )
+
+
+def run(args):
+    setup_test_environment(debug=False)
+    logging.disable(logging.WARNING)
+    if args.no_page_cache:
+        settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    author, kwargs = sample_kwargs()
+    staff, _ = User.objects.get_or_create(
+        username='benchmark-staff', defaults={'is_staff': True}
+    )
+    clients = {ANONYMOUS: Client(), AUTHOR: Client(), STAFF: Client()}
+    clients[AUTHOR].force_login(author)
+    clients[STAFF].force_login(staff)
+
+    results = []
+    # Writes bump the content versions, so they run after every cached
+    # page has been measured.
+    for route, url, method, client in sorted(
+        routes(kwargs), key=lambda route: route[2] != 'get'
+    ):
+        if method == 'get':
+            result = measure(clients[client], method, url, args.requests)
+        else:
+            with rolled_back():
+                result = measure(
+                    clients[client], method, url, args.requests
+                )
+        results.append({
+            'route': route, 'url': url, 'method': method.upper(),
+            'client': client, **result
+        })
+        print(
+            f'{route:<50} {client:>9} {result["status"]}'
+            f'  {result["miss_queries"]:3} miss / {result["queries"]:3} hit'
+            f' queries'
+            f'  p50 {result["p50_ms"]:8.2f} ms'
+            f'  p99 {result["p99_ms"]:8.2f} ms'
+            f'  {result["rps"]:8.1f} req/s'
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--comments', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=50,
+                        help='timed requests per URL and client')
+    parser.add_argument('--no-page-cache', action='store_true',
+                        help='disable the anonymous page cache')
+    parser.add_argument(
+        '--keep', metavar='PATH',
+        help='reuse (or create and keep) the seeded database at PATH'
+    )
+    parser.add_argument('--output', metavar='PATH',
+                        help='write the results as JSON to PATH')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='print p50 changes against an earlier run')
+    args = parser.parse_args()
+
+    with temporary_database(args.keep):
+        if not Post.objects.exists():
+            seed(args.posts, args.comments, users=args.users)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        results = run(args)
+        dataset = {
+            'posts': Post.objects.count(),
+            'comments': Comment.objects.count(),
+        }
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({
+                'commit': git_commit(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'dataset': dataset,
+                'requests': args.requests,
+                'page_cache': not args.no_page_cache,
+                'results': results,
+            }, output, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,43 @@
 from django.contrib import admin
 
-from .models import Category, Location, Post, Comment
+from .models import Category, Location, Post, Comment, ImageJob
+from .tasks import enqueue_image_job, retry_image_jobs
 
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
-admin.site.register(Comment)
+
+class BaseAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'is_published', 'created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at')
+
+
+admin.site.register(Category, BaseAdmin)
+admin.site.register(Location, BaseAdmin)
+admin.site.register(Comment, BaseAdmin)
+
+
+@admin.register(Post)
+class PostAdmin(BaseAdmin):
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if 'image' in form.changed_data and obj.image:
+            enqueue_image_job(obj)
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'image', 'post', 'status', 'attempts', 'created_at', 'finished_at'
+    )
+    list_filter = ('status',)
+    readonly_fields = (
+        'post', 'image', 'status', 'attempts', 'error',
+        'created_at', 'started_at', 'finished_at'
+    )
+    actions = ('retry',)
+
+    @admin.action(description='Повторить обработку')
+    def retry(self, request, queryset):
+        count = retry_image_jobs(queryset)
+        self.message_user(request, f'Задач поставлено в очередь: {count}')
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,186 @@
+import asyncio
+from calendar import timegm
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.http import HttpResponseNotAllowed
+from django.shortcuts import get_object_or_404, render
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import views
+from .cache import PAGES_CACHE, is_cacheable_page, page_cache_key
+from .forms import CommentForm
+from .models import Post, User
+
+
+@lru_cache(maxsize=None)
+def orm_executor(max_workers):
+    return ThreadPoolExecutor(max_workers, thread_name_prefix='blog-orm')
+
+
+def _closing_connections(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+async def run(func, *args, **kwargs):
+    """Run blocking ORM or template work without blocking the event loop.
+
+    Calls go to a pool of `BLOG_ASYNC_THREADS` threads, each keeping its
+    own database connection, so independent queries of a request can run
+    at the same time. With 0 threads everything runs on Django's single
+    shared sync thread instead.
+    """
+    threads = settings.BLOG_ASYNC_THREADS
+    if not threads:
+        return await sync_to_async(func)(*args, **kwargs)
+    return await sync_to_async(
+        _closing_connections(func),
+        thread_sensitive=False,
+        executor=orm_executor(threads)
+    )(*args, **kwargs)
+
+
+def _check_content(request, kwargs):
+    version = views.content_etag(request, **kwargs)
+    etag = quote_etag(version)
+    last_modified = timegm(
+        views.content_last_modified(request, **kwargs).utctimetuple()
+    )
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    key = None
+    if response is None and settings.BLOG_PAGE_CACHE_TIMEOUT \
+            and not request.user.is_authenticated:
+        key = page_cache_key(request, version)
+        response = caches[PAGES_CACHE].get(key)
+        if response is not None:
+            response['X-Cache'] = 'HIT'
+    return etag, last_modified, key, response
+
+
+def _store_page(request, kwargs, key, response):
+    versions = views.page_versions(request, **kwargs)
+    if is_cacheable_page(request, response, versions):
+        caches[PAGES_CACHE].set(
+            key, response, settings.BLOG_PAGE_CACHE_TIMEOUT
+        )
+
+
+def _published_page(view, queryset):
+    return views.paginate(view, views.select_post_cards(
+        views.filter_published(queryset)
+    ))
+
+
+def content_view(view):
+    """Async counterpart of `conditional_content` and `cached_for_anonymous`.
+
+    Only GET and HEAD are allowed. The session user is loaded while the
+    ETag is computed, so views can use `request.user` inside `run`.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+        etag, last_modified, key, response = await run(
+            _check_content, request, kwargs
+        )
+        if response is None:
+            response = await view(request, *args, **kwargs)
+            if key is not None:
+                response['X-Cache'] = 'MISS'
+                await run(_store_page, request, kwargs, key, response)
+
+        if not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified)
+        response.headers.setdefault('ETag', etag)
+        return response
+    return wrapper
+
+
+@content_view
+async def index(request):
+    view = views.Index(request=request, args=(), kwargs={})
+    page = await run(_published_page, view, Post.objects.all())
+    return await run(render, request, view.template_name, {
+        'page_obj': page,
+    })
+
+
+@content_view
+async def category_posts(request, category_slug):
+    view = views.CategoryPosts(
+        request=request, args=(), kwargs={'category_slug': category_slug}
+    )
+    category, page = await asyncio.gather(
+        run(view.get_object),
+        run(_published_page, view, Post.objects.filter(
+            category__slug=category_slug
+        )),
+    )
+    return await run(render, request, view.template_name, {
+        'category': category,
+        'object': category,
+        'page_obj': page,
+    })
+
+
+@content_view
+async def profile(request, username):
+    view = views.Profile(
+        request=request, args=(), kwargs={'username': username}
+    )
+    if request.user.username == username:
+        user = request.user
+        page = await run(views.paginate, view, views.select_post_cards(
+            Post.objects.filter(author=user)
+        ))
+    else:
+        user, page = await asyncio.gather(
+            run(get_object_or_404, User, username=username),
+            run(_published_page, view, Post.objects.filter(
+                author__username=username
+            )),
+        )
+    return await run(render, request, view.template_name, {
+        'profile': user,
+        'page_obj': page,
+    })
+
+
+@content_view
+async def post_detail(request, post_id):
+    view = views.PostDetail(
+        request=request, args=(), kwargs={'post_id': post_id}
+    )
+    post, comments = await asyncio.gather(
+        run(view.get_object),
+        run(views.paginate_comments, view, Post(pk=post_id)),
+    )
+    return await run(render, request, view.template_name, {
+        'post': post,
+        'object': post,
+        'form': CommentForm(),
+        'comments': comments,
+    })
+
+
+ASYNC_VIEWS = {
+    views.Index: index,
+    views.CategoryPosts: category_posts,
+    views.Profile: profile,
+    views.PostDetail: post_detail,
+}
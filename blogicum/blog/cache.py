@@ -0,0 +1,128 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+from .routers import replica_may_lag
+
+VERSION_PREFIX = 'blog:version'
+# Bumped by rare changes that show on every page: categories, locations
+# and user names. Posts and comments bump the keys of `post_page_keys`.
+CONTENT_VERSION_KEY = f'{VERSION_PREFIX}:content'
+FEED_VERSION_KEY = f'{VERSION_PREFIX}:feed'
+PAGE_PREFIX = 'blog:page'
+PAGES_CACHE = 'pages'
+
+
+def version_key(name, pk):
+    return f'{VERSION_PREFIX}:{name}:{pk}'
+
+
+def get_versions(*keys):
+    """Return the current version token of every key, issuing missing ones.
+
+    A token is the time it was issued in nanoseconds, so it both changes on
+    every bump and tells when the versioned object last changed.
+    """
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        token = time.time_ns()
+        for key in missing:
+            cache.add(key, token, None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_versions(*keys):
+    cache.delete_many(keys)
+
+
+def post_page_keys(post_id, category_id, username):
+    """Return the version keys of every page that shows a post or its card.
+
+    That is the post page, the feed, the category page and the author's
+    profile.
+    """
+    return [
+        version_key('post', post_id),
+        FEED_VERSION_KEY,
+        version_key('category_feed', category_id),
+        version_key('profile', username),
+    ]
+
+
+def post_card_versions(post):
+    return get_versions(
+        version_key('post', post.pk),
+        version_key('user', post.author_id),
+        version_key('category', post.category_id),
+        version_key('location', post.location_id),
+    )
+
+
+def post_card_version(post):
+    return '-'.join(map(str, post_card_versions(post)))
+
+
+def post_card_timeout(post):
+    if replica_may_lag(*post_card_versions(post)):
+        return 0
+    return settings.BLOG_POST_CARD_CACHE_TIMEOUT
+
+
+def is_cacheable_page(request, response, versions):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_USED')
+        and not replica_may_lag(*versions)
+    )
+
+
+def page_cache_key(request, version):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return ':'.join((PAGE_PREFIX, version, path))
+
+
+def anonymous_page_cache(etag_func, versions_func):
+    """Cache whole responses of a view for anonymous visitors.
+
+    Pages are keyed on `etag_func(request, ...)` and the full path, so a
+    change of any version the ETag is built from makes the stale pages
+    unreachable at once. `versions_func` returns those version tokens.
+    Responses that set cookies or use a CSRF token are never stored.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timeout = settings.BLOG_PAGE_CACHE_TIMEOUT
+            if not timeout or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            pages = caches[PAGES_CACHE]
+            key = page_cache_key(
+                request, etag_func(request, *args, **kwargs)
+            )
+            response = pages.get(key)
+            if response is not None:
+                response['X-Cache'] = 'HIT'
+                return response
+
+            def store(response):
+                versions = versions_func(request, *args, **kwargs)
+                if is_cacheable_page(request, response, versions):
+                    pages.set(key, response, timeout)
+
+            response = view(request, *args, **kwargs)
+            response['X-Cache'] = 'MISS'
+            if getattr(response, 'is_rendered', True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+            return response
+        return wrapper
+    return decorator
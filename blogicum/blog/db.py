@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+SQLITE_PROFILES = {
+    # SQLite defaults: rollback journal, every commit synced to disk.
+    'rollback': {
+        'journal_mode': 'delete',
+        'synchronous': 'full',
+    },
+    # Readers never block the writer and commits only wait for the WAL
+    # write; a busy writer is retried for up to five seconds.
+    'production': {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'busy_timeout': 5000,
+        'cache_size': -64 * 1024,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'memory',
+    },
+}
+
+
+def sqlite_pragmas():
+    return SQLITE_PROFILES[settings.BLOG_SQLITE_PROFILE]
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in sqlite_pragmas().items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
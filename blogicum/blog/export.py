@@ -0,0 +1,70 @@
+import csv
+import json
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Category, Comment, Location, Post
+
+EXPORT_MODELS = {
+    'posts': Post,
+    'comments': Comment,
+    'categories': Category,
+    'locations': Location,
+}
+NDJSON = 'ndjson'
+CSV = 'csv'
+CONTENT_TYPES = {
+    NDJSON: 'application/x-ndjson',
+    CSV: 'text/csv',
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def parse_since(value):
+    """Turn an ISO 8601 `--since` value into an aware datetime."""
+    if not value:
+        return None
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(f'Неверная дата: {value}')
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def export_fields(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def export_rows(model, since=None, chunk_size=2000):
+    rows = model.objects.order_by('pk')
+    if since is not None:
+        rows = rows.filter(updated_at__gte=since)
+    return rows.values_list(*export_fields(model)).iterator(chunk_size)
+
+
+def _plain(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def export_lines(model, fmt=NDJSON, since=None, chunk_size=2000):
+    """Yield the rows of `model` as NDJSON or CSV lines, one at a time."""
+    fields = export_fields(model)
+    rows = export_rows(model, since, chunk_size)
+    if fmt == CSV:
+        writer = csv.writer(Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow([_plain(value) for value in row])
+    else:
+        for row in rows:
+            yield json.dumps(
+                dict(zip(fields, map(_plain, row))), ensure_ascii=False
+            ) + '\n'
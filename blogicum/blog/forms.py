@@ -1,5 +1,6 @@
 from django.forms import ModelForm
 
+from .lookups import CachedModelChoiceField
 from .models import Comment, Post, User
 
 
@@ -34,3 +35,7 @@ class PostForm(ModelForm):
             'category',
             'is_published'
         )
+        field_classes = {
+            'location': CachedModelChoiceField,
+            'category': CachedModelChoiceField,
+        }
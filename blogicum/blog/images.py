@@ -0,0 +1,118 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+from .cache import bump_versions, post_page_keys
+from .models import Post
+
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITION_SIZES = '(max-width: 640px) 100vw, 640px'
+JPEG = ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True})
+WEBP = ('webp', 'WEBP', {'quality': 80, 'method': 4})
+EXIF_ORIENTATION = 0x0112
+
+
+def rendition_formats():
+    return (JPEG, WEBP) if features.check('webp') else (JPEG,)
+
+
+def rendition_name(name, width, extension):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'renditions', f'{stem}_{width}w.{extension}'
+    )
+
+
+def rendition_widths(original_width):
+    widths = [width for width in RENDITION_WIDTHS if width < original_width]
+    return widths or [original_width]
+
+
+def strip_metadata(post):
+    """Rewrite the original image without EXIF, applying its orientation.
+
+    Returns False when the image carries no EXIF and is left untouched.
+    Should another upload take the name meanwhile, the storage saves the
+    rewritten image under a new one, which is stored on the post.
+    """
+    image = post.image
+    with image.open('rb'), Image.open(image) as original:
+        exif = original.getexif()
+        if not exif:
+            return False
+        image_format = original.format
+        rotated = exif.get(EXIF_ORIENTATION, 1) != 1
+        upright = ImageOps.exif_transpose(original) if rotated else original
+        options = {}
+        if image_format == 'JPEG':
+            options['quality'] = 90 if rotated else 'keep'
+        buffer = BytesIO()
+        upright.save(buffer, image_format, **options)
+    image.storage.delete(image.name)
+    name = image.storage.save(image.name, ContentFile(buffer.getvalue()))
+    if name != image.name:
+        image.name = name
+        Post.objects.filter(pk=post.pk).update(image=name)
+    return True
+
+
+def generate_renditions(post):
+    """Write resized, re-encoded copies of the post image next to it.
+
+    Every width from `RENDITION_WIDTHS` narrower than the original is
+    produced as a progressive JPEG and, when Pillow supports it, WebP; an
+    image narrower than all of them gets a single re-encoded copy. EXIF
+    data is dropped after applying its orientation. The produced widths
+    are stored on the post so templates can build `srcset` without
+    touching the storage.
+    """
+    image = post.image
+    storage = image.storage
+    with image.open('rb'), Image.open(image) as original:
+        picture = ImageOps.exif_transpose(original)
+        if picture.mode not in ('RGB', 'L'):
+            picture = picture.convert('RGB')
+        widths = rendition_widths(picture.width)
+        for width in widths:
+            resized = picture.copy()
+            resized.thumbnail(
+                (width, picture.height), Image.Resampling.LANCZOS
+            )
+            for extension, image_format, options in rendition_formats():
+                buffer = BytesIO()
+                resized.save(buffer, image_format, **options)
+                name = rendition_name(image.name, width, extension)
+                storage.delete(name)
+                storage.save(name, ContentFile(buffer.getvalue()))
+
+    post.image_widths = ','.join(map(str, widths))
+    Post.objects.filter(pk=post.pk).update(image_widths=post.image_widths)
+    bump_versions(*post_page_keys(
+        post.pk, post.category_id, post.author.username
+    ))
+    return widths
+
+
+def delete_renditions(storage, name, image_widths):
+    for width in filter(None, image_widths.split(',')):
+        for extension, _, _ in rendition_formats():
+            storage.delete(rendition_name(name, width, extension))
+
+
+def image_srcsets(post):
+    try:
+        widths = [int(width) for width in post.image_widths.split(',')]
+    except ValueError:
+        return {}
+    storage = post.image.storage
+    return {
+        extension: ', '.join(
+            f'{storage.url(rendition_name(post.image.name, width, extension))}'
+            f' {width}w'
+            for width in widths
+        )
+        for extension, _, _ in rendition_formats()
+    }
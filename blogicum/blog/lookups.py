@@ -0,0 +1,114 @@
+from django.forms import ModelChoiceField, ValidationError
+from django.forms.models import ModelChoiceIterator
+
+from .cache import get_versions, version_key
+from .models import Category, Location
+from .routers import PRIMARY
+
+_tables = {}
+
+
+def table_version_key(model):
+    return version_key('table', model._meta.model_name)
+
+
+def lookup_table(model):
+    """Return every row of a small lookup model as a `{pk: obj}` dict.
+
+    The rows are kept in process memory together with the version token
+    they were loaded under, and reloaded once another process (or this
+    one) bumps the token. Tokens live in the default cache, so this needs
+    a cache shared by all processes (see `BLOG_CACHE`), and rows are read
+    from the primary database, which replicas may lag behind. The returned
+    objects are shared between requests and must not be modified.
+    """
+    version = get_versions(table_version_key(model))[0]
+    loaded = _tables.get(model)
+    if loaded is None or loaded[0] != version:
+        rows = {
+            obj.pk: obj
+            for obj in model.objects.using(PRIMARY).order_by('pk')
+        }
+        loaded = _tables[model] = (version, rows)
+    return loaded[1]
+
+
+def get_category(slug):
+    for category in lookup_table(Category).values():
+        if category.slug == slug:
+            return category
+    return None
+
+
+def attach_lookups(posts):
+    categories = lookup_table(Category)
+    locations = lookup_table(Location)
+    for post in posts:
+        if post.category_id in categories:
+            post.category = categories[post.category_id]
+        if post.location_id in locations:
+            post.location = locations[post.location_id]
+    return posts
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if not self.field.uses_table:
+            yield from super().__iter__()
+            return
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for obj in lookup_table(self.queryset.model).values():
+            yield self.choice(obj)
+
+    def __len__(self):
+        if not self.field.uses_table:
+            return super().__len__()
+        return len(lookup_table(self.queryset.model)) + (
+            self.field.empty_label is not None
+        )
+
+    def __bool__(self):
+        if not self.field.uses_table:
+            return super().__bool__()
+        return (
+            self.field.empty_label is not None
+            or bool(lookup_table(self.queryset.model))
+        )
+
+
+class CachedModelChoiceField(ModelChoiceField):
+    """`ModelChoiceField` that takes its choices from `lookup_table`.
+
+    The table holds every row, so a field whose queryset is narrowed
+    (filtered, sliced, or by `limit_choices_to`) behaves like the plain
+    field and queries the database.
+    """
+
+    iterator = CachedModelChoiceIterator
+
+    @property
+    def uses_table(self):
+        query = self.queryset.query
+        return not (
+            query.has_filters()
+            or query.is_sliced
+            or self.get_limit_choices_to()
+        )
+
+    def to_python(self, value):
+        if not self.uses_table:
+            return super().to_python(value)
+        if value in self.empty_values:
+            return None
+        model = self.queryset.model
+        if isinstance(value, model):
+            value = value.pk
+        try:
+            return lookup_table(model)[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
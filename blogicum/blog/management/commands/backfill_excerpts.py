@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import CONTENT_VERSION_KEY, bump_versions, version_key
+from blog.models import Post, make_excerpt
+
+
+class Command(BaseCommand):
+    help = 'Заполняет отрывки публикаций, показываемые в ленте.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько публикаций обрабатывать за один запрос.'
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересчитать отрывки всех публикаций, а не только пустые.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        posts = Post.objects.order_by('pk').only('pk', 'text', 'excerpt')
+        if not options['all']:
+            posts = posts.filter(excerpt='')
+
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            changed = []
+            for post in batch:
+                excerpt = make_excerpt(post.text)
+                if post.excerpt != excerpt:
+                    post.excerpt = excerpt
+                    changed.append(post)
+            Post.objects.bulk_update(changed, ['excerpt'])
+            bump_versions(
+                CONTENT_VERSION_KEY,
+                *(version_key('post', post.pk) for post in changed)
+            )
+            updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f'Обновлено отрывков: {updated}'))
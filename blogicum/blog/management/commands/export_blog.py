@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.export import CSV, EXPORT_MODELS, NDJSON, export_lines, parse_since
+
+
+class Command(BaseCommand):
+    help = 'Выгружает записи блога построчно в формате NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(EXPORT_MODELS))
+        parser.add_argument(
+            '--format', choices=(NDJSON, CSV), default=NDJSON,
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--since', metavar='DATETIME',
+            help='Выгрузить только записи, изменённые начиная с этого'
+                 ' момента (ISO 8601).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Сколько записей читать из базы за раз.'
+        )
+        parser.add_argument(
+            '--output', metavar='PATH',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.'
+        )
+
+    def handle(self, *args, model, chunk_size, **options):
+        try:
+            since = parse_since(options['since'])
+        except ValueError as error:
+            raise CommandError(error)
+        lines = export_lines(
+            EXPORT_MODELS[model], options['format'], since, chunk_size
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8',
+                      newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_renditions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересоздать копии и для уже обработанных изображений.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['all']:
+            posts = posts.filter(image_widths='')
+
+        done = failed = 0
+        for pk in list(posts.values_list('pk', flat=True)):
+            post = Post.objects.only('image').get(pk=pk)
+            try:
+                widths = generate_renditions(post)
+            except (OSError, ValueError) as error:
+                failed += 1
+                self.stderr.write(f'{post.pk} {post.image.name}: {error}')
+            else:
+                done += 1
+                self.stdout.write(
+                    f'{post.pk} {post.image.name}: '
+                    f'{", ".join(map(str, widths))}'
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {done}, с ошибками: {failed}'
+        ))
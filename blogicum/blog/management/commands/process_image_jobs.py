@@ -0,0 +1,48 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import ImageJob
+from blog.tasks import run_image_job
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать текущую очередь и завершиться.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=2,
+            help='Пауза между опросами очереди, в секундах.'
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help='Через сколько секунд зависшая задача возвращается'
+                 ' в очередь.'
+        )
+
+    def handle(self, *args, once, interval, stale_after, **options):
+        while True:
+            ImageJob.objects.filter(
+                status=ImageJob.RUNNING,
+                started_at__lt=timezone.now() - timedelta(seconds=stale_after)
+            ).update(status=ImageJob.PENDING)
+
+            job_pks = list(ImageJob.objects.filter(
+                status=ImageJob.PENDING
+            ).values_list('pk', flat=True)[:100])
+            for job_pk in job_pks:
+                run_image_job(job_pk)
+                job = ImageJob.objects.filter(pk=job_pk).first()
+                if job is not None:
+                    self.stdout.write(f'{job}')
+
+            if once and not job_pks:
+                return
+            if not job_pks:
+                time.sleep(interval)
@@ -0,0 +1,35 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Удаляет истёкшие сессии пачками, не блокируя базу надолго.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько сессий удалять за один запрос.'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Пауза между пачками в секундах.'
+        )
+
+    def handle(self, *args, batch_size, pause, **options):
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+        purged = 0
+        while True:
+            keys = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not keys:
+                break
+            purged += Session.objects.filter(pk__in=keys).delete()[0]
+            self.stdout.write(f'Удалено сессий: {purged}')
+            if pause:
+                time.sleep(pause)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Истёкших сессий удалено: {purged}'
+        ))
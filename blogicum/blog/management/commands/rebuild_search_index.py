@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.search import rebuild_index, use_fts
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс публикаций и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько записей читать за один запрос.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        with transaction.atomic():
+            indexed = rebuild_index(batch_size)
+        backend = 'FTS5' if use_fts() else 'SearchTerm'
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано записей: {indexed} ({backend})'
+        ))
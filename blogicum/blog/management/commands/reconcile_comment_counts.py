@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.cache import CONTENT_VERSION_KEY, bump_versions, version_key
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённое количество комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько публикаций обновлять за один запрос.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать расхождения, ничего не меняя.'
+        )
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        actual = Coalesce(Subquery(
+            Comment.objects.filter(post=OuterRef('pk')).order_by().values(
+                'post'
+            ).annotate(count=Count('pk')).values('count')
+        ), 0)
+        drifted = list(Post.objects.order_by().annotate(
+            actual_count=actual
+        ).exclude(
+            comment_count=F('actual_count')
+        ).values_list('pk', 'comment_count', 'actual_count'))
+
+        for pk, stored, counted in drifted:
+            self.stdout.write(f'{pk}: {stored} -> {counted}')
+
+        if not dry_run:
+            for start in range(0, len(drifted), batch_size):
+                batch = drifted[start:start + batch_size]
+                Post.objects.bulk_update(
+                    [Post(pk=pk, comment_count=counted)
+                     for pk, _, counted in batch],
+                    ['comment_count']
+                )
+                bump_versions(
+                    CONTENT_VERSION_KEY,
+                    *(version_key('post', pk) for pk, _, _ in batch)
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Расхождений {"найдено" if dry_run else "исправлено"}: '
+            f'{len(drifted)}'
+        ))
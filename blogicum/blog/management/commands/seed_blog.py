@@ -0,0 +1,64 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from blog.seeding import seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, категориями,'
+        ' местоположениями, публикациями и комментариями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Сколько строк вставлять за один запрос.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Начальное значение генератора случайных чисел.'
+        )
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Показатель распределения Ципфа для популярности авторов,'
+                 ' категорий и обсуждаемых публикаций.'
+        )
+        parser.add_argument(
+            '--scheduled', type=float, default=0.02,
+            help='Доля отложенных публикаций.'
+        )
+        parser.add_argument(
+            '--unpublished', type=float, default=0.05,
+            help='Доля снятых с публикации записей.'
+        )
+        parser.add_argument(
+            '--search-index', action='store_true',
+            help='Перестроить поисковый индекс после заполнения.'
+        )
+
+    def handle(self, *args, **options):
+        seed(
+            options['posts'],
+            options['comments'],
+            users=options['users'],
+            categories=options['categories'],
+            locations=options['locations'],
+            batch_size=options['batch_size'],
+            random_seed=options['seed'],
+            exponent=options['zipf'],
+            scheduled=options['scheduled'],
+            unpublished=options['unpublished'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        if options['search_index']:
+            call_command(
+                'rebuild_search_index', batch_size=options['batch_size'],
+                stdout=self.stdout
+            )
+        self.stdout.write(self.style.SUCCESS('База заполнена.'))
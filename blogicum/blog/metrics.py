@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class ViewStats:
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.sql_seconds = 0
+        self.render_seconds = 0
+        self.response_bytes = 0
+
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def record(view, duration, queries, sql_time, render_time, size):
+    with _lock:
+        stats = _stats.setdefault(view, ViewStats())
+        stats.duration.observe(duration)
+        stats.queries.observe(queries)
+        stats.sql_seconds += sql_time
+        stats.render_seconds += render_time
+        stats.response_bytes += size
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def _histogram_lines(name, view, histogram):
+    for bound, total in histogram.cumulative():
+        yield f'{name}_bucket{{view="{view}",le="{bound}"}} {total}'
+    yield f'{name}_sum{{view="{view}"}} {histogram.sum}'
+    yield f'{name}_count{{view="{view}"}} {sum(histogram.counts)}'
+
+
+def render_prometheus():
+    """Return the collected per-view metrics in Prometheus text format."""
+    with _lock:
+        stats = sorted(_stats.items())
+        lines = [
+            '# TYPE blog_request_duration_seconds histogram',
+            *(line for view, item in stats for line in _histogram_lines(
+                'blog_request_duration_seconds', view, item.duration
+            )),
+            '# TYPE blog_request_queries histogram',
+            *(line for view, item in stats for line in _histogram_lines(
+                'blog_request_queries', view, item.queries
+            )),
+        ]
+        for name, attr in (
+            ('blog_request_sql_seconds_total', 'sql_seconds'),
+            ('blog_request_render_seconds_total', 'render_seconds'),
+            ('blog_response_bytes_total', 'response_bytes'),
+        ):
+            lines.append(f'# TYPE {name} counter')
+            lines.extend(
+                f'{name}{{view="{view}"}} {getattr(item, attr)}'
+                for view, item in stats
+            )
+    return '\n'.join(lines) + '\n'
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    func = getattr(match.func, 'view_class', match.func)
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+_request_timer = ContextVar('blog_request_timer', default=None)
+
+
+def _time_request_query(execute, sql, params, many, context):
+    timer = _request_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_request_timer(sender, connection, **kwargs):
+    """Attribute queries to the request being served, on any thread.
+
+    The current request's timer is looked up in a context variable, which
+    `sync_to_async` copies into the threads running async views' queries.
+    """
+    if _time_request_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_request_query)
+
+
+class RequestMetricsMiddleware:
+    """Record query count, SQL, render and total time of every view.
+
+    Enabled by the `BLOG_METRICS_ENABLED` setting. Requests exceeding any
+    of the `BLOG_METRICS_BUDGETS` are logged as warnings.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.BLOG_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        timer, token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        self.finish(request, response, timer, started)
+        return response
+
+    async def __acall__(self, request):
+        timer, token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        self.finish(request, response, timer, started)
+        return response
+
+    def start(self, request):
+        request._metrics_render_seconds = 0
+        timer = QueryTimer()
+        return timer, _request_timer.set(timer), time.perf_counter()
+
+    def finish(self, request, response, timer, started):
+        duration = time.perf_counter() - started
+        view = view_name(request)
+        if view is not None:
+            size = 0 if response.streaming else len(response.content)
+            render_time = request._metrics_render_seconds
+            record(view, duration, timer.count, timer.seconds, render_time,
+                   size)
+            self.check_budgets(request, view, {
+                'queries': timer.count,
+                'sql_ms': timer.seconds * 1000,
+                'render_ms': render_time * 1000,
+                'total_ms': duration * 1000,
+            })
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_render_seconds = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def check_budgets(self, request, view, measured):
+        exceeded = [
+            f'{name}={measured[name]:g} (budget {budget:g})'
+            for name, budget in settings.BLOG_METRICS_BUDGETS.items()
+            if measured.get(name, 0) > budget
+        ]
+        if exceeded:
+            logger.warning(
+                '%s %s exceeded its budget in %s: %s',
+                request.method, request.path, view, ', '.join(exceeded)
+            )
@@ -0,0 +1,59 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:56
+
+from django.db import OperationalError, migrations, models
+import django.db.models.deletion
+
+
+def create_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE blog_post_search '
+                'USING fts5(title, body)'
+            )
+        except OperationalError:
+            return
+        cursor.execute(
+            'CREATE VIRTUAL TABLE blog_comment_search USING fts5(body)'
+        )
+        cursor.execute(
+            'INSERT INTO blog_post_search (rowid, title, body) '
+            'SELECT id, title, text FROM blog_post'
+        )
+        cursor.execute(
+            'INSERT INTO blog_comment_search (rowid, body) '
+            'SELECT id, text FROM blog_comment'
+        )
+
+
+def drop_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS blog_post_search')
+        schema_editor.execute('DROP TABLE IF EXISTS blog_comment_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_imagejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=64, verbose_name='Слово')),
+                ('weight', models.PositiveIntegerField(default=1, verbose_name='Вес')),
+                ('comment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='blog.comment', verbose_name='Комментарий')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'слово поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+            },
+        ),
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
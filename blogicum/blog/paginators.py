@@ -0,0 +1,162 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+NEXT = 'next'
+PREVIOUS = 'prev'
+LAST = 'last'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(NEXT, self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(PREVIOUS, self.object_list[0])
+
+    @property
+    def last_cursor(self):
+        return self.paginator.encode_cursor(LAST)
+
+
+class KeysetPaginator:
+    """Paginates a queryset by seeking past the last seen ordering key.
+
+    Unlike `django.core.paginator.Paginator` it never counts rows and never
+    uses OFFSET: every page is a single indexed range scan limited to
+    `per_page + 1` rows, the extra row telling whether another page exists.
+    The ordering must be unique, so it should end with the primary key.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-pk')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+
+    @property
+    def _fields(self):
+        return [name.lstrip('-') for name in self.ordering]
+
+    def _model_field(self, name):
+        opts = self.object_list.model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def _key(self, obj):
+        return [
+            getattr(obj, self._model_field(name).attname)
+            for name in self._fields
+        ]
+
+    def encode_cursor(self, direction, obj=None):
+        values = None if obj is None else [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in self._key(obj)
+        ]
+        raw = json.dumps([direction, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, values = json.loads(raw)
+            if direction == LAST:
+                return direction, None
+            if direction not in (NEXT, PREVIOUS) or \
+                    len(values) != len(self._fields):
+                raise InvalidCursor(cursor)
+            return direction, [
+                self._model_field(name).to_python(value)
+                for name, value in zip(self._fields, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise InvalidCursor(cursor)
+
+    def _seek(self, values, reverse=False):
+        condition = Q()
+        for i, name in enumerate(self.ordering):
+            field = name.lstrip('-')
+            descending = name.startswith('-') != reverse
+            step = Q(**{
+                f'{field}__{"lt" if descending else "gt"}': values[i]
+            })
+            for prev_field, value in zip(self._fields[:i], values[:i]):
+                step &= Q(**{prev_field: value})
+            condition |= step
+        return condition
+
+    @staticmethod
+    def _reversed(ordering):
+        return [
+            name[1:] if name.startswith('-') else f'-{name}'
+            for name in ordering
+        ]
+
+    def page(self, cursor=None):
+        direction, values = (
+            (NEXT, None) if cursor is None else self.decode_cursor(cursor)
+        )
+        if direction == NEXT:
+            queryset = self.object_list.order_by(*self.ordering)
+            if values is not None:
+                queryset = queryset.filter(self._seek(values))
+        else:
+            queryset = self.object_list.order_by(
+                *self._reversed(self.ordering)
+            )
+            if values is not None:
+                queryset = queryset.filter(self._seek(values, reverse=True))
+
+        items = list(queryset[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+
+        if direction == NEXT:
+            return KeysetPage(items, self, has_more, values is not None)
+        items.reverse()
+        return KeysetPage(items, self, values is not None, has_more)
+
+    def get_page(self, cursor=None):
+        try:
+            return self.page(cursor or None)
+        except InvalidCursor:
+            return self.page()
@@ -0,0 +1,74 @@
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from .metrics import view_name
+
+PRIMARY = 'default'
+STICKY_COOKIE = 'blog_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_ONLY_APPS = {'sessions'}
+
+_use_replica = ContextVar('blog_use_replica', default=False)
+
+
+def replica_may_lag(*versions):
+    """Tell whether this request reads replicas that may miss a change.
+
+    `versions` are cache version tokens, issued in nanoseconds when the
+    versioned data last changed. Replicas are assumed to catch up within
+    `BLOG_REPLICA_STICKINESS` seconds, so anything rendered from them
+    earlier must not be cached under those versions.
+    """
+    if not settings.BLOG_REPLICA_DATABASES or not _use_replica.get():
+        return False
+    caught_up = time.time_ns() - settings.BLOG_REPLICA_STICKINESS * 10 ** 9
+    return any(version > caught_up for version in versions)
+
+
+class ReplicaRouter:
+    """Send reads to a replica while a read-only view is being served.
+
+    Everything else, including all writes, goes to the primary database.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.BLOG_REPLICA_DATABASES
+        if not replicas or not _use_replica.get() or \
+                model._meta.app_label in PRIMARY_ONLY_APPS:
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaMiddleware(MiddlewareMixin):
+    """Route the views listed in `BLOG_REPLICA_VIEWS` to the replicas.
+
+    After a successful write the client gets a short-lived cookie that
+    keeps its reads on the primary, so authors see their own changes
+    before the replicas catch up.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in SAFE_METHODS \
+                and STICKY_COOKIE not in request.COOKIES \
+                and view_name(request) in settings.BLOG_REPLICA_VIEWS:
+            _use_replica.set(True)
+
+    def process_response(self, request, response):
+        _use_replica.set(False)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                STICKY_COOKIE, '1',
+                max_age=settings.BLOG_REPLICA_STICKINESS,
+                httponly=True, samesite='Lax'
+            )
+        return response
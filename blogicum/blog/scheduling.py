@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Post
+
+HORIZON_KEY = 'blog:publish_horizon'
+
+
+def _next_release(now):
+    return Post.objects.filter(
+        is_published=True,
+        pub_date__gt=now
+    ).order_by('pub_date').values_list('pub_date', flat=True).first()
+
+
+def publish_horizon():
+    """Return the publication cutoff to use for published feeds.
+
+    The set of published posts only changes when a scheduled post reaches
+    its `pub_date` or when a post is saved, so the cutoff computed at the
+    last such event is reused until then. This keeps feed queries (and
+    anything keyed on them) identical between scheduled releases.
+
+    With a per-process cache, saves clear the horizon only in the process
+    that made them, so every `BLOG_PUBLISH_HORIZON_REFRESH` seconds it is
+    checked against the database: the cutoff moves on if posts were
+    published since, and the next release is looked up again.
+    """
+    now = timezone.now()
+    horizon = cache.get(HORIZON_KEY)
+    if horizon is None or horizon['next_release'] is not None \
+            and horizon['next_release'] <= now:
+        horizon = {'cutoff': now, 'next_release': _next_release(now)}
+    elif now < horizon['checked'] + timedelta(
+            seconds=settings.BLOG_PUBLISH_HORIZON_REFRESH):
+        return horizon['cutoff']
+    else:
+        horizon['next_release'] = _next_release(now)
+        if Post.objects.filter(
+                is_published=True,
+                pub_date__gt=horizon['cutoff'],
+                pub_date__lte=now
+        ).exists():
+            horizon['cutoff'] = now
+    horizon['checked'] = now
+    cache.set(HORIZON_KEY, horizon, None)
+    return horizon['cutoff']
+
+
+def reset_publish_horizon():
+    cache.delete(HORIZON_KEY)
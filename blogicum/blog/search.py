@@ -0,0 +1,144 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Comment, Post, SearchTerm
+
+POST_TABLE = 'blog_post_search'
+COMMENT_TABLE = 'blog_comment_search'
+TITLE_WEIGHT = 3
+TERM_LENGTH = SearchTerm._meta.get_field('term').max_length
+
+
+def tokenize(text):
+    return [
+        word[:TERM_LENGTH] for word in re.findall(r'\w+', text.lower())
+        if len(word) > 1
+    ]
+
+
+@lru_cache(maxsize=None)
+def _fts_tables_exist(database):
+    return POST_TABLE in connection.introspection.table_names()
+
+
+def use_fts():
+    """Whether the SQLite FTS5 tables back the search index.
+
+    `BLOG_SEARCH_BACKEND` may force 'fts5' or 'python'; with 'auto' FTS5 is
+    used whenever the migration managed to create its tables, and the
+    `SearchTerm` inverted index otherwise.
+    """
+    backend = settings.BLOG_SEARCH_BACKEND
+    if backend == 'python':
+        return False
+    available = connection.vendor == 'sqlite' and \
+        _fts_tables_exist(str(connection.settings_dict['NAME']))
+    if backend == 'fts5' and not available:
+        raise RuntimeError(f'FTS5 table {POST_TABLE} is missing.')
+    return available
+
+
+def _replace_fts_row(table, rowid, **columns):
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [rowid])
+        if columns:
+            cursor.execute(
+                f'INSERT INTO {table} (rowid, {", ".join(columns)}) '
+                f'VALUES (%s{", %s" * len(columns)})',
+                [rowid, *columns.values()]
+            )
+
+
+def _replace_terms(post_id, comment_id, weights):
+    SearchTerm.objects.filter(post_id=post_id, comment_id=comment_id).delete()
+    SearchTerm.objects.bulk_create(
+        SearchTerm(
+            term=term, post_id=post_id, comment_id=comment_id, weight=weight
+        )
+        for term, weight in weights.items()
+    )
+
+
+def index_post(post):
+    if use_fts():
+        _replace_fts_row(POST_TABLE, post.pk, title=post.title, body=post.text)
+        return
+    weights = Counter(tokenize(post.text))
+    for term in tokenize(post.title):
+        weights[term] += TITLE_WEIGHT
+    _replace_terms(post.pk, None, weights)
+
+
+def index_comment(comment):
+    if use_fts():
+        _replace_fts_row(COMMENT_TABLE, comment.pk, body=comment.text)
+        return
+    weights = Counter(tokenize(comment.text))
+    _replace_terms(comment.post_id, comment.pk, weights)
+
+
+def unindex_post(post_id):
+    if use_fts():
+        _replace_fts_row(POST_TABLE, post_id)
+
+
+def unindex_comment(comment_id):
+    if use_fts():
+        _replace_fts_row(COMMENT_TABLE, comment_id)
+
+
+def search_posts(queryset, query):
+    """Narrow `queryset` down to the posts matching every word of `query`.
+
+    A post matches when all the words are found either in the post itself
+    or together in one of its comments.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return queryset.none()
+    if use_fts():
+        match = ' '.join(f'"{term}"' for term in terms)
+        return queryset.filter(Q(pk__in=RawSQL(
+            f'SELECT rowid FROM {POST_TABLE} WHERE {POST_TABLE} MATCH %s',
+            [match]
+        )) | Q(pk__in=RawSQL(
+            f'SELECT blog_comment.post_id FROM {COMMENT_TABLE} '
+            f'JOIN blog_comment ON blog_comment.id = {COMMENT_TABLE}.rowid '
+            f'WHERE {COMMENT_TABLE} MATCH %s',
+            [match]
+        )))
+    return queryset.filter(pk__in=SearchTerm.objects.filter(
+        term__in=terms
+    ).values('post', 'comment').annotate(
+        matched=Count('term')
+    ).filter(matched=len(terms)).values('post'))
+
+
+def rebuild_index(batch_size=1000):
+    if use_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {POST_TABLE}')
+            cursor.execute(f'DELETE FROM {COMMENT_TABLE}')
+    else:
+        SearchTerm.objects.all().delete()
+    indexed = 0
+    for model, index in ((Post, index_post), (Comment, index_comment)):
+        fields = ('title', 'text') if model is Post else ('post', 'text')
+        last_pk = 0
+        while True:
+            batch = list(model.objects.order_by('pk').filter(
+                pk__gt=last_pk
+            ).only(*fields)[:batch_size])
+            if not batch:
+                break
+            for item in batch:
+                index(item)
+            indexed += len(batch)
+            last_pk = batch[-1].pk
+    return indexed
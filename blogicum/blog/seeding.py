@@ -0,0 +1,147 @@
+import random
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from faker import Faker
+
+from .cache import CONTENT_VERSION_KEY, bump_versions
+from .lookups import table_version_key
+from .models import Category, Comment, Location, Post, make_excerpt
+from .scheduling import reset_publish_horizon
+
+User = get_user_model()
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class ZipfChoice:
+    """Draw items with Zipf-skewed popularity.
+
+    The k-th most popular item is picked with a probability proportional
+    to `1 / k ** exponent`. Ranks are shuffled, so popularity does not
+    follow insertion order.
+    """
+
+    def __init__(self, items, exponent, rng):
+        self.items = list(items)
+        rng.shuffle(self.items)
+        self.cum_weights = list(accumulate(
+            1 / (rank + 1) ** exponent for rank in range(len(self.items))
+        ))
+        self.rng = rng
+
+    def __call__(self, k=1):
+        return self.rng.choices(self.items, cum_weights=self.cum_weights, k=k)
+
+
+def _last_pk(model):
+    return model.objects.aggregate(last=Max('pk'))['last'] or 0
+
+
+def _new_pks(model, after):
+    return model.objects.filter(pk__gt=after).order_by('pk').values_list(
+        'pk', flat=True
+    )
+
+
+def seed(posts, comments=0, users=1000, categories=20, locations=50,
+         batch_size=10000, random_seed=0, exponent=1.1, scheduled=0.02,
+         unpublished=0.05, log=None):
+    """Bulk insert a synthetic dataset with a realistic shape.
+
+    Authors, categories and commented posts are picked with Zipf-skewed
+    popularity, a share of posts is scheduled or unpublished. Rows are
+    produced by generators and inserted in batches, so memory grows with
+    the number of users and posts but not with the number of comments.
+    Signals are not sent: caches are invalidated once at the end.
+    """
+    rng = random.Random(random_seed)
+    fake = Faker('ru_RU')
+    fake.seed_instance(random_seed)
+    words = fake.words(500)
+    now = timezone.now()
+    log = log or (lambda message: None)
+
+    def text(n):
+        return ' '.join(rng.choices(words, k=n))
+
+    def insert(model, rows):
+        last_pk = _last_pk(model)
+        inserted = 0
+        for batch in batched(rows, batch_size):
+            model.objects.bulk_create(batch)
+            inserted += len(batch)
+            log(f'{model._meta.verbose_name_plural}: {inserted}')
+        return last_pk
+
+    first = insert(User, (
+        User(username=f'seed{random_seed}-{i}', password='!')
+        for i in range(_last_pk(User), _last_pk(User) + users)
+    ))
+    pick_author = ZipfChoice(_new_pks(User, first), exponent, rng)
+
+    first = insert(Category, (
+        Category(title=text(2), description=text(10),
+                 slug=f'seed{random_seed}-{i}',
+                 is_published=rng.random() > 0.1)
+        for i in range(_last_pk(Category), _last_pk(Category) + categories)
+    ))
+    pick_category = ZipfChoice(_new_pks(Category, first), exponent, rng)
+
+    first = insert(Location, (
+        Location(name=fake.city()) for _ in range(locations)
+    ))
+    location_ids = list(_new_pks(Location, first))
+
+    def new_post():
+        body = text(60)
+        delay = timedelta(minutes=rng.randint(1, 60 * 24 * 30))
+        return Post(
+            title=text(4), text=body, excerpt=make_excerpt(body),
+            pub_date=now + delay if rng.random() < scheduled else (
+                now - timedelta(minutes=rng.randint(0, 60 * 24 * 365 * 3))
+            ),
+            is_published=rng.random() >= unpublished,
+            author_id=pick_author()[0],
+            category_id=pick_category()[0],
+            location_id=rng.choice(location_ids + [None]),
+        )
+
+    first_post = insert(Post, (new_post() for _ in range(posts)))
+
+    if comments:
+        pick_post = ZipfChoice(_new_pks(Post, first_post), exponent, rng)
+
+        def new_comments():
+            remaining = comments
+            while remaining > 0:
+                k = min(batch_size, remaining)
+                for post_id, author_id in zip(pick_post(k), pick_author(k)):
+                    yield Comment(
+                        text=text(15), author_id=author_id, post_id=post_id
+                    )
+                remaining -= k
+
+        insert(Comment, new_comments())
+        Post.objects.filter(pk__gt=first_post).update(
+            comment_count=Coalesce(Subquery(
+                Comment.objects.filter(post=OuterRef('pk')).order_by().values(
+                    'post'
+                ).annotate(count=Count('pk')).values('count')
+            ), 0)
+        )
+
+    bump_versions(
+        CONTENT_VERSION_KEY,
+        table_version_key(Category),
+        table_version_key(Location),
+    )
+    reset_publish_horizon()
@@ -0,0 +1,199 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import (
+    CONTENT_VERSION_KEY, bump_versions, post_page_keys, version_key
+)
+from .images import delete_renditions
+from .lookups import table_version_key
+from .models import Category, Comment, Location, Post
+from .scheduling import reset_publish_horizon
+from .search import (
+    index_comment, index_post, unindex_comment, unindex_post
+)
+
+User = get_user_model()
+
+# User fields shown on cached pages: post cards and comments show the
+# username, the profile page the rest.
+USER_PAGE_FIELDS = ('username', 'first_name', 'last_name', 'is_staff')
+
+
+def change_comment_count(post_id, delta):
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(comment_count=F('comment_count') + delta)
+    post = Post.objects.filter(pk=post_id).values(
+        'category_id', 'author__username'
+    ).first()
+    if post is not None:
+        bump_versions(*post_page_keys(
+            post_id, post['category_id'], post['author__username']
+        ))
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._old_post_id = Comment.objects.filter(
+        pk=instance.pk
+    ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_post_id = getattr(instance, '_old_post_id', None)
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif old_post_id != instance.post_id:
+        change_comment_count(old_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(pre_save, sender=Post)
+def remember_saved_post(sender, instance, raw=False, **kwargs):
+    """Keep the stored image, category and author of a post being saved.
+
+    A replaced image loses its rendition widths: they describe the old
+    file, so `srcset` must not be built from them until the image job has
+    processed the new one. The old category and author tell which pages
+    the post leaves.
+    """
+    instance._old_post = None
+    if raw or instance.pk is None:
+        return
+    old = instance._old_post = Post.objects.filter(pk=instance.pk).values(
+        'image', 'image_widths', 'category_id', 'author__username'
+    ).first()
+    if old is not None and old['image'] != instance.image.name:
+        instance.image_widths = ''
+
+
+@receiver(post_save, sender=Post)
+def delete_replaced_renditions(sender, instance, **kwargs):
+    old = getattr(instance, '_old_post', None)
+    if old is not None and old['image'] \
+            and old['image'] != instance.image.name:
+        delete_renditions(
+            instance.image.storage, old['image'], old['image_widths']
+        )
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_renditions(sender, instance, **kwargs):
+    if instance.image:
+        delete_renditions(
+            instance.image.storage, instance.image.name,
+            instance.image_widths
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_post_pages(sender, instance, **kwargs):
+    keys = post_page_keys(
+        instance.pk, instance.category_id, instance.author.username
+    )
+    old = getattr(instance, '_old_post', None)
+    if old is not None:
+        keys += post_page_keys(
+            instance.pk, old['category_id'], old['author__username']
+        )
+    bump_versions(*keys)
+
+
+@receiver(post_save, sender=Comment)
+def bump_comment_post(sender, instance, **kwargs):
+    bump_versions(version_key('post', instance.post_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+def bump_cached_version(sender, instance, **kwargs):
+    bump_versions(
+        version_key(sender._meta.model_name, instance.pk),
+        CONTENT_VERSION_KEY
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_user_page_fields(sender, instance, raw=False, update_fields=None,
+                              **kwargs):
+    """Note which user fields shown on cached pages are being changed.
+
+    Logins save `last_login` and password upgrades save `password`, and
+    neither may drop the cached pages, so saves that do not touch
+    `USER_PAGE_FIELDS` are ignored without querying the old row.
+    """
+    instance._changed_page_fields = ()
+    fields = USER_PAGE_FIELDS
+    if update_fields is not None:
+        fields = [name for name in fields if name in update_fields]
+    if raw or instance.pk is None or not fields:
+        return
+    old = User.objects.filter(pk=instance.pk).values(*fields).first() or {}
+    instance._changed_page_fields = [
+        name for name in fields
+        if old.get(name) != getattr(instance, name)
+    ]
+
+
+@receiver(post_save, sender=User)
+def bump_user_version(sender, instance, created, **kwargs):
+    changed = instance.__dict__.pop('_changed_page_fields', ())
+    if created or not changed:
+        return
+    keys = [CONTENT_VERSION_KEY]
+    if 'username' in changed:
+        keys.append(version_key('user', instance.pk))
+    bump_versions(*keys)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def bump_lookup_table(sender, **kwargs):
+    bump_versions(table_version_key(sender))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def move_publish_horizon(sender, **kwargs):
+    reset_publish_horizon()
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def index_saved_comment(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_comment(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_deleted_comment(sender, instance, **kwargs):
+    unindex_comment(instance.pk)
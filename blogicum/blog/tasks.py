@@ -0,0 +1,105 @@
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .images import generate_renditions, strip_metadata
+from .models import ImageJob
+
+SYNC = 'sync'
+THREAD = 'thread'
+WORKER = 'worker'
+
+logger = logging.getLogger(__name__)
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BLOG_IMAGE_JOBS_THREADS,
+            thread_name_prefix='image-jobs'
+        )
+    return _executor
+
+
+def enqueue_image_job(post):
+    """Queue decoding, EXIF stripping and resizing of the post image.
+
+    `BLOG_IMAGE_JOBS_MODE` picks who runs the job: `sync` runs it right
+    away in the caller (used by tests), `thread` hands it to an in-process
+    thread pool once the transaction commits, and `worker` leaves it to
+    the `process_image_jobs` command polling the job table.
+    """
+    job = ImageJob.objects.create(post=post, image=post.image.name)
+    dispatch_image_job(job.pk)
+    return job
+
+
+def dispatch_image_job(job_pk):
+    mode = settings.BLOG_IMAGE_JOBS_MODE
+    if mode == SYNC:
+        run_image_job(job_pk)
+    elif mode == THREAD:
+        transaction.on_commit(
+            lambda: get_executor().submit(run_image_job_in_thread, job_pk)
+        )
+
+
+def claim_image_job(job_pk):
+    return ImageJob.objects.filter(
+        pk=job_pk,
+        status=ImageJob.PENDING
+    ).update(
+        status=ImageJob.RUNNING,
+        started_at=timezone.now(),
+        attempts=F('attempts') + 1
+    ) == 1
+
+
+def run_image_job(job_pk):
+    if not claim_image_job(job_pk):
+        return
+    job = ImageJob.objects.select_related('post').filter(pk=job_pk).first()
+    if job is None:
+        return
+    try:
+        if job.post.image.name == job.image:
+            strip_metadata(job.post)
+            generate_renditions(job.post)
+    except Exception:
+        logger.exception('Image job %s failed', job_pk)
+        job.status = ImageJob.FAILED
+        job.error = traceback.format_exc()
+    else:
+        job.status = ImageJob.DONE
+        job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=('status', 'error', 'finished_at'))
+
+
+def run_image_job_in_thread(job_pk):
+    close_old_connections()
+    try:
+        run_image_job(job_pk)
+    finally:
+        close_old_connections()
+
+
+def retry_image_jobs(queryset):
+    job_pks = list(queryset.exclude(
+        status=ImageJob.RUNNING
+    ).values_list('pk', flat=True))
+    ImageJob.objects.filter(pk__in=job_pks).update(
+        status=ImageJob.PENDING,
+        started_at=None,
+        finished_at=None
+    )
+    for job_pk in job_pks:
+        dispatch_image_job(job_pk)
+    return len(job_pks)
@@ -0,0 +1,37 @@
+from django import template
+
+from blog.cache import post_card_timeout as get_post_card_timeout
+from blog.cache import post_card_version as get_post_card_version
+from blog.images import RENDITION_SIZES, image_srcsets
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card_version(post):
+    return get_post_card_version(post)
+
+
+@register.simple_tag
+def post_card_timeout(post):
+    return get_post_card_timeout(post)
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, css_class=''):
+    return {
+        'post': post,
+        'css_class': css_class,
+        'srcsets': image_srcsets(post),
+        'sizes': RENDITION_SIZES,
+    }
+
+
+@register.simple_tag(takes_context=True)
+def cursor_url(context, cursor=None):
+    request = context['request']
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    if cursor:
+        params['cursor'] = cursor
+    return f'?{params.urlencode()}' if params else request.path
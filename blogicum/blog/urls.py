@@ -1,22 +1,39 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
+from .async_views import ASYNC_VIEWS
 
 app_name = 'blog'
 
+
+def read_only_view(view_class):
+    if settings.BLOG_ASYNC_VIEWS:
+        return ASYNC_VIEWS[view_class]
+    return view_class.as_view()
+
+
 urlpatterns = [
     path('',
-         views.Index.as_view(), name='index'),
+         read_only_view(views.Index), name='index'),
     path('profile/',
          views.YourProfile.as_view(), name='profile'),
     path('profile/<username>/',
-         views.Profile.as_view(), name='profile'),
+         read_only_view(views.Profile), name='profile'),
     path('edit_profile/',
          views.EditProfile.as_view(), name='edit_profile'),
     path('posts/<int:post_id>/',
-         views.PostDetail.as_view(), name='post_detail'),
+         read_only_view(views.PostDetail), name='post_detail'),
+    path('posts/<int:post_id>/comments/',
+         views.PostComments.as_view(), name='post_comments'),
+    path('export/<slug:model>/',
+         views.Export.as_view(), name='export'),
+    path('metrics/',
+         views.Metrics.as_view(), name='metrics'),
+    path('search/',
+         views.Search.as_view(), name='search'),
     path('category/<slug:category_slug>/',
-         views.CategoryPosts.as_view(), name='category_posts'),
+         read_only_view(views.CategoryPosts), name='category_posts'),
     path('posts/create/',
          views.CreatePost.as_view(), name='create_post'),
     path('posts/<int:post_id>/edit/',
@@ -1,43 +1,130 @@
+import hashlib
 from datetime import datetime, timezone
 
-from django.db.models import Count
-from django.http import HttpResponseRedirect, HttpResponseNotAllowed, Http404
+from django.http import (
+    HttpResponse, HttpResponseBadRequest, HttpResponseRedirect,
+    HttpResponseNotAllowed, Http404, StreamingHttpResponse
+)
 from django.shortcuts import get_object_or_404, resolve_url, redirect
-from django.core.paginator import Paginator
 from django.core.exceptions import PermissionDenied
 from django.views.generic import (
     UpdateView, CreateView, DeleteView, DetailView,
-    ListView, TemplateView, RedirectView
+    ListView, TemplateView, RedirectView, View
 )
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
+from .cache import (
+    CONTENT_VERSION_KEY, FEED_VERSION_KEY, anonymous_page_cache,
+    get_versions, version_key
+)
 from .models import Category, Comment, Post, User
+from .export import (
+    CONTENT_TYPES, EXPORT_MODELS, NDJSON, export_lines, parse_since
+)
 from .forms import ProfileForm, CommentForm, PostForm
+from .lookups import attach_lookups, get_category
+from .metrics import render_prometheus
+from .paginators import KeysetPaginator
+from .scheduling import publish_horizon
+from .search import search_posts
+from .tasks import enqueue_image_job
+
+
+def paginate(self, object_list, per_page=10):
+    page = KeysetPaginator(object_list, per_page).get_page(
+        self.request.GET.get('cursor')
+    )
+    attach_lookups(page.object_list)
+    return page
+
+
+def paginate_comments(self, post):
+    return KeysetPaginator(
+        post.comments.select_related('author'),
+        self.comments_per_page,
+        ordering=('created_at', 'pk')
+    ).get_page(self.request.GET.get('cursor'))
+
+
+def page_versions(request, post_id=None, category_slug=None, username=None):
+    """Return the version tokens of the post, category, profile or feed page.
+
+    Each page only depends on its own key and the sitewide content version,
+    so a new comment, say, leaves the pages of other posts, categories and
+    authors cached.
+    """
+    if post_id is not None:
+        key = version_key('post', post_id)
+    elif category_slug is not None:
+        category = get_category(category_slug)
+        key = version_key('category_feed', category and category.pk)
+    elif username is not None:
+        key = version_key('profile', username)
+    else:
+        key = FEED_VERSION_KEY
+    return get_versions(CONTENT_VERSION_KEY, key)
+
+
+def content_etag(request, *args, **kwargs):
+    parts = [
+        *page_versions(request, **kwargs), publish_horizon().timestamp()
+    ]
+    if request.user.is_authenticated:
+        # Their pages embed the CSRF token, which every login rotates.
+        csrf = hashlib.md5(request.META.get('CSRF_COOKIE', '').encode())
+        parts += [request.user.pk, csrf.hexdigest()[:12]]
+    else:
+        parts.append(None)
+    return '-'.join(map(str, parts))
+
+
+def content_last_modified(request, *args, **kwargs):
+    return max(
+        datetime.fromtimestamp(
+            max(page_versions(request, **kwargs)) / 1e9, timezone.utc
+        ),
+        publish_horizon()
+    )
 
 
-def paginate(self, object_list):
-    return Paginator(object_list, 10).get_page(self.request.GET.get("page"))
+conditional_content = method_decorator(
+    condition(content_etag, content_last_modified), name='get'
+)
+cached_for_anonymous = method_decorator(
+    anonymous_page_cache(content_etag, page_versions), name='get'
+)
 
 
 def filter_published(queryset):
     return queryset.filter(
         is_published=True,
-        pub_date__lte=datetime.now(timezone.utc),
+        pub_date__lte=publish_horizon(),
         category__is_published=True
     )
 
 
-def prefetch_post_info(queryset):
-    return queryset.prefetch_related(
-        'author',
-        'category',
-        'location',
-        'comments'
-    ).annotate(
-        comment_count=Count("comments")
-    ).order_by('-pub_date')
+POST_CARD_FIELDS = (
+    'title',
+    'excerpt',
+    'image',
+    'image_widths',
+    'pub_date',
+    'is_published',
+    'comment_count',
+    'category',
+    'location',
+    'author__username',
+)
+
+
+def select_post_cards(queryset):
+    return queryset.select_related(
+        'author'
+    ).only(*POST_CARD_FIELDS).order_by('-pub_date', '-pk')
 
 
 @method_decorator(login_required, name='dispatch')
@@ -46,6 +133,8 @@ class YourProfile(RedirectView):
         return resolve_url('blog:profile', get_user(self.request).username)
 
 
+@conditional_content
+@cached_for_anonymous
 class Profile(TemplateView):
     template_name = 'blog/profile.html'
 
@@ -62,7 +151,7 @@ class Profile(TemplateView):
             user = get_object_or_404(User, username=username)
             posts = filter_published(user.posts)
 
-        posts = prefetch_post_info(posts)
+        posts = select_post_cards(posts)
 
         context.update(
             profile=user,
@@ -83,24 +172,55 @@ class EditProfile(UpdateView):
         return get_user(self.request)
 
 
+@conditional_content
+@cached_for_anonymous
 class Index(ListView):
     template_name = 'blog/index.html'
     paginate_by = 10
-    queryset = prefetch_post_info(
-        filter_published(Post.objects.all())
-    )
 
+    def get_queryset(self):
+        return select_post_cards(
+            filter_published(Post.objects.all())
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate(self, queryset, page_size)
+        return page.paginator, page, page.object_list, page.has_other_pages()
+
+
+class Search(TemplateView):
+    template_name = 'blog/search.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        posts = search_posts(
+            select_post_cards(filter_published(Post.objects.all())),
+            query
+        )
+        context.update(
+            query=query,
+            page_obj=paginate(self, posts)
+        )
+        return context
+
+
+@conditional_content
+@cached_for_anonymous
 class CategoryPosts(DetailView):
     template_name = 'blog/category.html'
     model = Category
-    slug_url_kwarg = 'category_slug'
     context_object_name = 'category'
-    queryset = Category.objects.filter(is_published=True)
+
+    def get_object(self, queryset=None):
+        category = get_category(self.kwargs['category_slug'])
+        if category is None or not category.is_published:
+            raise Http404
+        return category
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        posts = prefetch_post_info(
+        posts = select_post_cards(
             filter_published(self.object.posts)
         )
         context['page_obj'] = paginate(self, posts)
@@ -168,19 +288,23 @@ class DeleteComment(DeleteView):
         return comment
 
 
+@conditional_content
+@cached_for_anonymous
 class PostDetail(DetailView):
     template_name = 'blog/detail.html'
     model = Post
     pk_url_kwarg = 'post_id'
     context_object_name = 'post'
-    queryset = Post.objects.all().prefetch_related('comments')
+    queryset = Post.objects.select_related('author')
+    comments_per_page = 20
 
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        if obj.author == get_user(self.request) or \
+        attach_lookups([obj])
+        if obj.author_id == self.request.user.pk or \
                 obj.is_published and \
                 obj.category.is_published and \
-                obj.pub_date <= datetime.now(timezone.utc):
+                obj.pub_date <= publish_horizon():
             return obj
         else:
             raise Http404
@@ -189,7 +313,7 @@ class PostDetail(DetailView):
         context = super().get_context_data(**kwargs)
 
         form = CommentForm()
-        comments = context['post'].comments.all().prefetch_related('author')
+        comments = paginate_comments(self, self.object)
 
         context.update(
             form=form,
@@ -198,6 +322,16 @@ class PostDetail(DetailView):
         return context
 
 
+class PostComments(PostDetail):
+    template_name = 'includes/comment_list.html'
+
+    def get_context_data(self, **kwargs):
+        return {
+            'post': self.object,
+            'comments': paginate_comments(self, self.object)
+        }
+
+
 @method_decorator(login_required, name='dispatch')
 class CreatePost(CreateView):
     template_name = 'blog/create.html'
@@ -217,6 +351,8 @@ class CreatePost(CreateView):
         if post.pub_date is None:
             post.pub_date = datetime.now(timezone.utc)
         post.save()
+        if post.image:
+            enqueue_image_job(post)
         return HttpResponseRedirect(self.get_success_url())
 
 
@@ -235,6 +371,12 @@ class EditPost(UpdateView):
             raise PermissionDenied
         return obj
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        if 'image' in form.changed_data and self.object.image:
+            enqueue_image_job(self.object)
+        return response
+
     def post(self, request, *args, **kwargs):
         try:
             return super().post(request, *args, **kwargs)
@@ -260,3 +402,38 @@ class DeletePost(DeleteView):
         if obj.author != get_user(self.request):
             raise PermissionDenied
         return obj
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class Metrics(View):
+    def get(self, request):
+        return HttpResponse(
+            render_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class Export(View):
+    def get(self, request, model):
+        if model not in EXPORT_MODELS:
+            raise Http404
+        fmt = request.GET.get('format', NDJSON)
+        try:
+            if fmt not in CONTENT_TYPES:
+                raise ValueError(f'Неизвестный формат: {fmt}')
+            since = parse_since(request.GET.get('since'))
+        except ValueError as error:
+            # Plain text, because the message repeats the query string.
+            return HttpResponseBadRequest(
+                str(error), content_type='text/plain; charset=utf-8'
+            )
+
+        response = StreamingHttpResponse(
+            export_lines(EXPORT_MODELS[model], fmt, since),
+            content_type=f'{CONTENT_TYPES[fmt]}; charset=utf-8'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{model}.{fmt}"'
+        )
+        return response
@@ -0,0 +1,27 @@
+import time
+
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class ThrottledFileBasedCache(FileBasedCache):
+    """File cache that checks its size at most every `CULL_INTERVAL` seconds.
+
+    Django's file cache lists the whole directory on every `set` to see
+    whether `MAX_ENTRIES` is reached. Here each process does that once per
+    interval, so the cache may briefly grow past the limit between checks.
+    """
+
+    _next_cull = {}
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_interval = params.get('OPTIONS', {}).get(
+            'CULL_INTERVAL', 60
+        )
+
+    def _cull(self):
+        now = time.monotonic()
+        if now < self._next_cull.get(self._dir, 0):
+            return
+        self._next_cull[self._dir] = now + self._cull_interval
+        super()._cull()
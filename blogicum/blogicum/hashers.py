@@ -0,0 +1,102 @@
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+
+def cost_setting(name, key):
+    return property(lambda self: getattr(settings, name)[key])
+
+
+class ScryptPasswordHasher(hashers.BasePasswordHasher):
+    """Secure password hashing using the scrypt algorithm.
+
+    A backport of the hasher shipped with Django 4.0, built on
+    `hashlib.scrypt`, with the cost taken from `BLOG_SCRYPT_COST`.
+    """
+
+    algorithm = 'scrypt'
+    dklen = 64
+    work_factor = cost_setting('BLOG_SCRYPT_COST', 'work_factor')
+    block_size = cost_setting('BLOG_SCRYPT_COST', 'block_size')
+    parallelism = cost_setting('BLOG_SCRYPT_COST', 'parallelism')
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r * p,
+            dklen=self.dklen,
+        )
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return f'{self.algorithm}${n}${salt}${r}${p}${hash_}'
+
+    def decode(self, encoded):
+        algorithm, work_factor, salt, block_size, parallelism, hash_ = \
+            encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'work_factor': int(work_factor),
+            'salt': salt,
+            'block_size': int(block_size),
+            'parallelism': int(parallelism),
+            'hash': hash_,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password,
+            decoded['salt'],
+            decoded['work_factor'],
+            decoded['block_size'],
+            decoded['parallelism'],
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): decoded['algorithm'],
+            _('work factor'): decoded['work_factor'],
+            _('block size'): decoded['block_size'],
+            _('parallelism'): decoded['parallelism'],
+            _('salt'): hashers.mask_hash(decoded['salt']),
+            _('hash'): hashers.mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (
+            decoded['work_factor'] != self.work_factor
+            or decoded['block_size'] != self.block_size
+            or decoded['parallelism'] != self.parallelism
+        )
+
+    def harden_runtime(self, password, encoded):
+        # The runtime for scrypt is too complicated to implement a sensible
+        # hardening algorithm.
+        pass
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Django's Argon2 hasher with the cost taken from `BLOG_ARGON2_COST`.
+
+    Needs the optional argon2-cffi package.
+    """
+
+    time_cost = cost_setting('BLOG_ARGON2_COST', 'time_cost')
+    memory_cost = cost_setting('BLOG_ARGON2_COST', 'memory_cost')
+    parallelism = cost_setting('BLOG_ARGON2_COST', 'parallelism')
@@ -0,0 +1,86 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+RATE_LIMIT_PREFIX = 'blog:ratelimit'
+
+
+def client_ip(request):
+    """Return the client address as seen by the first trusted proxy.
+
+    Each of the `BLOG_TRUSTED_PROXIES` reverse proxies appends the address
+    it got the request from to X-Forwarded-For, so only that many entries
+    from the right can be trusted; anything before them is up to the
+    client. Requests that did not pass all proxies use REMOTE_ADDR.
+    """
+    proxies = settings.BLOG_TRUSTED_PROXIES
+    forwarded = [
+        address.strip() for address in
+        request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        if address.strip()
+    ]
+    if proxies and len(forwarded) >= proxies:
+        return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def count_attempt(scope, kind, value, window):
+    """Count an attempt in the current fixed window and return the total.
+
+    Only backends with an atomic `incr`, such as memcached, count exactly.
+    The file cache reads and rewrites the counter, so concurrent attempts
+    may be counted once.
+    """
+    digest = hashlib.md5(value.encode()).hexdigest()
+    key = ':'.join((
+        RATE_LIMIT_PREFIX, scope, kind, digest,
+        str(int(time.time()) // window)
+    ))
+    cache.add(key, 0, window)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, window)
+        return 1
+
+
+def auth_rate_limit(scope):
+    """Reject POSTs once an IP or a username runs out of attempts.
+
+    The limits come from `BLOG_AUTH_RATE_LIMITS` and are counted per
+    `BLOG_AUTH_RATE_WINDOW` seconds before the form is validated, so
+    rejected attempts never reach the password hasher. Usernames are
+    counted per client IP, so nobody can lock another user out of their
+    account by failing logins under their name. Counters live in the
+    default cache, which all workers share (see `BLOG_CACHE`).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'POST':
+                return view(request, *args, **kwargs)
+
+            window = settings.BLOG_AUTH_RATE_WINDOW
+            limits = settings.BLOG_AUTH_RATE_LIMITS
+            ip = client_ip(request)
+            username = request.POST.get('username', '').strip().lower()
+            values = {'ip': ip}
+            if username:
+                values['username'] = f'{username}\n{ip}'
+            exceeded = [
+                kind for kind, value in values.items()
+                if count_attempt(scope, kind, value, window) > limits[kind]
+            ]
+            if exceeded:
+                response = HttpResponse(
+                    'Слишком много попыток. Попробуйте позже.', status=429
+                )
+                response['Retry-After'] = window - int(time.time()) % window
+                return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
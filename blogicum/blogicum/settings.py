@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,12 +47,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'blog.routers.ReplicaMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -81,9 +87,59 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
     }
 }
 
+# Read replicas, as a list of SQLite files separated by os.pathsep in
+# the BLOG_DB_REPLICAS environment variable. The views listed in
+# BLOG_REPLICA_VIEWS read from them, except for clients that have written
+# something in the last BLOG_REPLICA_STICKINESS seconds.
+
+BLOG_REPLICA_DATABASES = []
+
+for i, path in enumerate(
+        filter(None, os.environ.get('BLOG_DB_REPLICAS', '').split(os.pathsep)),
+        start=1
+):
+    DATABASES[f'replica{i}'] = {
+        **DATABASES['default'],
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    BLOG_REPLICA_DATABASES.append(f'replica{i}')
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+BLOG_REPLICA_VIEWS = [
+    'blog.views.Index',
+    'blog.views.CategoryPosts',
+    'blog.views.Profile',
+    'blog.views.PostDetail',
+    'blog.views.PostComments',
+    'blog.views.Search',
+    'blog.async_views.index',
+    'blog.async_views.category_posts',
+    'blog.async_views.profile',
+    'blog.async_views.post_detail',
+    'django.views.generic.base.TemplateView',
+]
+
+BLOG_REPLICA_STICKINESS = 10
+
+# Async views for the feed, category, profile and post pages, enabled by
+# default when served through asgi.py. Their queries run in a pool of
+# BLOG_ASYNC_THREADS threads, or on Django's shared sync thread with 0.
+
+BLOG_ASYNC_VIEWS = os.environ.get('BLOG_ASYNC_VIEWS') == '1'
+
+BLOG_ASYNC_THREADS = 8
+
+# SQLite pragmas applied to every new connection, see `blog.db`:
+# 'production' (WAL, relaxed syncing, bigger caches) or 'rollback'.
+
+BLOG_SQLITE_PROFILE = 'production'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -103,6 +159,47 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+
+# Password hashing: BLOG_PASSWORD_HASHER hashes new passwords, the others
+# only verify older hashes, which are rehashed on the next login. 'argon2'
+# needs the argon2-cffi package.
+
+BLOG_PASSWORD_HASHERS = {
+    'scrypt': 'blogicum.hashers.ScryptPasswordHasher',
+    'argon2': 'blogicum.hashers.Argon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+
+BLOG_PASSWORD_HASHER = os.environ.get('BLOG_PASSWORD_HASHER', 'scrypt')
+
+PASSWORD_HASHERS = [
+    BLOG_PASSWORD_HASHERS[BLOG_PASSWORD_HASHER],
+    *(hasher for name, hasher in BLOG_PASSWORD_HASHERS.items()
+      if name != BLOG_PASSWORD_HASHER),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+BLOG_SCRYPT_COST = {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 1}
+
+BLOG_ARGON2_COST = {'time_cost': 2, 'memory_cost': 102400, 'parallelism': 8}
+
+
+# Login and registration attempts allowed per client IP and per username
+# from one IP within BLOG_AUTH_RATE_WINDOW seconds. The counters are exact
+# only with an atomic cache such as 'memcached'; the 'file' cache may
+# miss attempts made at the same moment.
+
+BLOG_AUTH_RATE_LIMITS = {'ip': 30, 'username': 10}
+
+BLOG_AUTH_RATE_WINDOW = 60
+
+# Number of reverse proxies in front of the site that append the client
+# address to X-Forwarded-For. With 0 the header is ignored and clients
+# are told apart by REMOTE_ADDR.
+
+BLOG_TRUSTED_PROXIES = int(os.environ.get('BLOG_TRUSTED_PROXIES', 0))
+
+
 LOGIN_URL = '/auth/login/'
 
 LOGIN_REDIRECT_URL = '/profile/'
@@ -136,6 +233,114 @@ MEDIA_ROOT = 'media/'
 MEDIA_URL = '/media/'
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+#
+# The cache holds the content versions, sessions and rate-limit counters,
+# and the 'pages' cache the rendered pages and post cards, so every worker
+# process must use the same ones. BLOG_CACHE is 'file' (directories on
+# local disk, for workers on one host), 'memcached' (needs the pymemcache
+# package) or 'locmem', which is per process and only correct for a single
+# process: the page and post card caches are turned off with it.
+# BLOG_CACHE_LOCATION overrides the directory or the memcached address;
+# the 'pages' directory is next to it.
+
+BLOG_CACHE_BACKENDS = {
+    'file': (
+        'blogicum.cache_backends.ThrottledFileBasedCache',
+        os.path.join(tempfile.gettempdir(), 'blogicum-cache'),
+    ),
+    'memcached': (
+        'django.core.cache.backends.memcached.PyMemcacheCache',
+        '127.0.0.1:11211',
+    ),
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'blogicum'),
+}
+
+BLOG_CACHE = os.environ.get('BLOG_CACHE', 'file')
+
+BLOG_CACHE_SHARED = BLOG_CACHE != 'locmem'
+
+BLOG_CACHE_LOCATION = os.environ.get(
+    'BLOG_CACHE_LOCATION', BLOG_CACHE_BACKENDS[BLOG_CACHE][1]
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': BLOG_CACHE_BACKENDS[BLOG_CACHE][0],
+        'LOCATION': BLOG_CACHE_LOCATION,
+    },
+    'pages': {
+        'BACKEND': BLOG_CACHE_BACKENDS[BLOG_CACHE][0],
+        'LOCATION': BLOG_CACHE_LOCATION,
+        'KEY_PREFIX': 'pages',
+    },
+}
+if BLOG_CACHE != 'memcached':
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 10000}
+    CACHES['pages']['LOCATION'] = f'{BLOG_CACHE_LOCATION}-pages'
+    CACHES['pages']['OPTIONS'] = {'MAX_ENTRIES': 50000}
+
+
+# Sessions: 'db', 'cached_db' (read from the cache, written through to
+# the database) or 'signed_cookies' (stored in the client, no database
+# access at all). Expired rows are removed by `manage.py purge_sessions`.
+# 'cached_db' needs a shared cache: with a per-process one, logging out
+# would leave the session alive in the other processes.
+
+BLOG_SESSION_MODE = os.environ.get(
+    'BLOG_SESSION_MODE', 'cached_db' if BLOG_CACHE_SHARED else 'db'
+)
+if BLOG_SESSION_MODE == 'cached_db' and not BLOG_CACHE_SHARED:
+    raise ImproperlyConfigured(
+        "BLOG_SESSION_MODE 'cached_db' needs a shared BLOG_CACHE."
+    )
+
+SESSION_ENGINE = f'django.contrib.sessions.backends.{BLOG_SESSION_MODE}'
+
+
+# Background image processing: 'sync', 'thread' or 'worker'
+# (the latter is served by `manage.py process_image_jobs`).
+
+BLOG_IMAGE_JOBS_MODE = 'thread'
+
+BLOG_IMAGE_JOBS_THREADS = 2
+
+
+# Search index backend: 'auto' (SQLite FTS5 when available), 'fts5'
+# or 'python' (inverted index kept in the SearchTerm table).
+
+BLOG_SEARCH_BACKEND = 'auto'
+
+
+# How often, in seconds, each process checks its cached feed publication
+# cutoff against the database for posts published by other processes.
+
+BLOG_PUBLISH_HORIZON_REFRESH = 30
+
+
+# How long whole pages are cached for anonymous visitors and rendered post
+# cards for everyone, in seconds (0 disables the cache). Content changes
+# invalidate them right away.
+
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 60 if BLOG_CACHE_SHARED else 0
+
+BLOG_POST_CARD_CACHE_TIMEOUT = 24 * 60 * 60 if BLOG_CACHE_SHARED else 0
+
+
+# Per-view request metrics, served to staff at /metrics/ in Prometheus
+# text format. Requests over any budget are logged by `blog.metrics`.
+
+BLOG_METRICS_ENABLED = True
+
+BLOG_METRICS_BUDGETS = {
+    'queries': 10,
+    'sql_ms': 100,
+    'render_ms': 200,
+    'total_ms': 500,
+}
+
+
 # Email
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
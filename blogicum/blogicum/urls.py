@@ -28,6 +28,7 @@ urlpatterns = [
     path('', include('blog.urls')),
     path('pages/', include('pages.urls')),
     path('admin/', admin.site.urls),
+    path('auth/login/', views.Login.as_view(), name='login'),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/',
          views.Registration.as_view(), name='registration'),
@@ -1,8 +1,18 @@
 from django.views.generic import CreateView
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login
+from django.contrib.auth.views import LoginView
+from django.utils.decorators import method_decorator
 
+from .ratelimit import auth_rate_limit
 
+
+@method_decorator(auth_rate_limit('login'), name='post')
+class Login(LoginView):
+    pass
+
+
+@method_decorator(auth_rate_limit('registration'), name='post')
 class Registration(CreateView):
     template_name = 'registration/registration_form.html'
     form_class = UserCreationForm
@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +42,31 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache(tmp_path_factory):
+    with override_settings(CACHES={
+        alias: {
+            "BACKEND": "blogicum.cache_backends.ThrottledFileBasedCache",
+            "LOCATION": str(tmp_path_factory.mktemp(alias)),
+        }
+        for alias in ("default", "pages")
+    }):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def process_images_synchronously():
+    with override_settings(BLOG_IMAGE_JOBS_MODE="sync"):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -121,6 +147,16 @@ def user_client(user):
     return client
 
 
+@pytest.fixture
+def staff_client(django_user_model):
+    staff = django_user_model.objects.create_user(
+        username="staff", password="password", is_staff=True
+    )
+    client = Client()
+    client.force_login(staff)
+    return client
+
+
 @pytest.fixture
 def unlogged_client(client):
     return client
@@ -361,6 +397,7 @@ def cleanup(request):
         for filename in files:
             if (
                     filename.endswith(".jpg")
+                    or filename.endswith(".webp")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
             ):
@@ -0,0 +1,143 @@
+from importlib import reload
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import clear_url_caches
+
+from blog import metrics, urls as blog_urls
+from blogicum import urls as root_urls
+
+pytestmark = [pytest.mark.django_db]
+
+
+def reload_urls():
+    reload(blog_urls)
+    reload(root_urls)
+    clear_url_caches()
+
+
+@pytest.fixture(autouse=True)
+def async_views(settings):
+    settings.BLOG_ASYNC_VIEWS = True
+    settings.BLOG_ASYNC_THREADS = 0
+    reload_urls()
+    yield
+    settings.BLOG_ASYNC_VIEWS = False
+    reload_urls()
+
+
+def page_urls(post):
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    ]
+
+
+def test_pages_are_served_by_async_views(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in page_urls(post):
+        response = client.get(url)
+        assert response.resolver_match.func.__module__ == "blog.async_views"
+        assert response.status_code == 200
+        assert post.title in response.content.decode(), (
+            f"Убедитесь, что асинхронная страница {url} показывает"
+            " публикацию."
+        )
+
+
+def test_async_post_detail_shows_comments(
+        client, mixer, post_with_published_location
+):
+    comments = mixer.cycle(3).blend(
+        "blog.Comment",
+        post=post_with_published_location,
+        text=mixer.sequence("Комментарий {0}"),
+    )
+    content = client.get(
+        f"/posts/{post_with_published_location.id}/"
+    ).content.decode()
+    for comment in comments:
+        assert comment.text in content, (
+            "Убедитесь, что асинхронная страница публикации показывает"
+            " комментарии."
+        )
+
+
+def test_async_views_not_found(client, mixer, post_with_published_location):
+    unpublished = mixer.blend(
+        "blog.Post",
+        is_published=False,
+        category=post_with_published_location.category,
+    )
+    for url in (
+        f"/posts/{unpublished.id}/",
+        "/category/no-such-category/",
+        "/profile/no-such-user/",
+    ):
+        assert client.get(url).status_code == 404, (
+            f"Убедитесь, что асинхронная страница {url} возвращает 404."
+        )
+
+
+def test_author_sees_own_unpublished_post(
+        user_client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=False,
+        category=published_category,
+    )
+    assert user_client.get(f"/posts/{post.id}/").status_code == 200
+    profile = user_client.get(f"/profile/{user.username}/")
+    assert post.title in profile.content.decode()
+
+
+def test_async_views_conditional_get(client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert client.post(url).status_code == 405
+
+
+def test_async_views_page_cache(
+        settings, client, post_with_published_location
+):
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 60
+    url = f"/posts/{post_with_published_location.id}/"
+    assert client.get(url)["X-Cache"] == "MISS"
+    assert client.get(url)["X-Cache"] == "HIT"
+
+
+def test_asgi_client(post_with_published_location):
+    response = async_to_sync(AsyncClient().get)(
+        f"/posts/{post_with_published_location.id}/"
+    )
+    assert response.status_code == 200
+    assert post_with_published_location.title in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_thread_pool(settings, client, mixer, post_with_published_location):
+    settings.BLOG_ASYNC_THREADS = 2
+    metrics.reset()
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, text="Комментарий"
+    )
+    for url in page_urls(post_with_published_location):
+        assert client.get(url).status_code == 200
+    assert comment.text in client.get(
+        f"/posts/{post_with_published_location.id}/"
+    ).content.decode(), (
+        "Убедитесь, что запросы асинхронных страниц выполняются в пуле"
+        " потоков."
+    )
+    stats = metrics._stats["blog.async_views.post_detail"]
+    assert stats.queries.sum > 0, (
+        "Убедитесь, что запросы из пула потоков учитываются в метриках."
+    )
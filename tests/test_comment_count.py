@@ -0,0 +1,68 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def stored_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_comment_count_follows_views(
+        user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    for text in ("Первый", "Второй"):
+        user_client.post(f"/posts/{post.id}/comment/", {"text": text})
+    assert stored_count(post) == 2, (
+        "Убедитесь, что при создании комментария увеличивается сохранённое"
+        " количество комментариев публикации."
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert stored_count(post) == 1, (
+        "Убедитесь, что при удалении комментария уменьшается сохранённое"
+        " количество комментариев публикации."
+    )
+
+
+def test_comment_count_follows_bulk_deletes(
+        mixer, post_with_published_location, another_category
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    other_post = mixer.blend("blog.Post", category=another_category)
+    moved = mixer.blend("blog.Comment", post=post)
+    assert stored_count(post) == 4
+
+    moved.post = other_post
+    moved.save()
+    assert (stored_count(post), stored_count(other_post)) == (3, 1)
+
+    Comment.objects.filter(post=post)[:1].get().delete()
+    Comment.objects.filter(post=post).delete()
+    assert stored_count(post) == 0
+
+    post.delete()
+    assert stored_count(other_post) == 1
+
+
+def test_reconcile_comment_counts(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    out = StringIO()
+    call_command("reconcile_comment_counts", "--dry-run", stdout=out)
+    assert f"{post.pk}: 42 -> 3" in out.getvalue()
+    assert stored_count(post) == 42
+
+    call_command("reconcile_comment_counts", stdout=StringIO())
+    assert stored_count(post) == 3
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+COMMENTS_PER_PAGE = 20
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    now = timezone.now()
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    for i, comment in enumerate(comments):
+        comment.created_at = now - timedelta(minutes=len(comments) - i)
+        comment.save()
+    return comments
+
+
+def test_post_detail_renders_first_comments(client, many_comments):
+    post = many_comments[0].post
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    assert [comment.id for comment in page] == [
+        comment.id for comment in many_comments[:COMMENTS_PER_PAGE]
+    ], (
+        "Убедитесь, что на странице публикации отображается ограниченное"
+        " количество первых комментариев."
+    )
+    assert f"/posts/{post.id}/comments/?cursor={page.next_cursor}" in (
+        response.content.decode()
+    )
+
+
+def test_load_more_comments(client, many_comments):
+    post = many_comments[0].post
+    first_page = client.get(f"/posts/{post.id}/").context["comments"]
+    response = client.get(
+        f"/posts/{post.id}/comments/?cursor={first_page.next_cursor}"
+    )
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert "<html" not in content
+    for comment in many_comments[COMMENTS_PER_PAGE:]:
+        assert f'name="comment_{comment.id}"' in content
+    assert f'name="comment_{many_comments[0].id}"' not in content
+    assert not response.context["comments"].has_next(), (
+        "Убедитесь, что подгрузка комментариев возвращает оставшиеся"
+        " комментарии и не предлагает загрузить ещё."
+    )
+
+
+def test_comments_fragment_of_hidden_post(
+        client, user_client, many_comments
+):
+    post = many_comments[0].post
+    post.is_published = False
+    post.save()
+    assert client.get(f"/posts/{post.id}/comments/").status_code == 404
+    assert user_client.get(f"/posts/{post.id}/comments/").status_code == 200
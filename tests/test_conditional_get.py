@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import scheduling
+
+pytestmark = [pytest.mark.django_db]
+
+
+def feed_urls(post):
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    ]
+
+
+def test_unchanged_pages_answer_not_modified(
+        client, django_assert_num_queries, post_with_published_location
+):
+    for url in feed_urls(post_with_published_location):
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response["ETag"]
+        assert response.has_header("Last-Modified")
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            "Убедитесь, что при неизменном содержимом страница отвечает"
+            f" статусом 304 на условный запрос: {url}"
+        )
+
+
+def test_changes_invalidate_etag(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    for url in feed_urls(post):
+        etag = client.get(url)["ETag"]
+        mixer.blend("blog.Comment", post=post)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            "Убедитесь, что после изменения содержимого условный запрос"
+            f" получает страницу заново: {url}"
+        )
+
+
+def test_etag_varies_per_user(
+        client, user_client, post_with_published_location
+):
+    url = f"/profile/{post_with_published_location.author.username}/"
+    etag = client.get(url)["ETag"]
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что автор не получает закешированную версию страницы,"
+        " предназначенную другим пользователям."
+    )
+
+
+def test_scheduled_release_invalidates_etag(
+        client, monkeypatch, mixer, user, published_category
+):
+    now = timezone.now()
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(hours=1),
+    )
+    etag = client.get("/")["ETag"]
+    monkeypatch.setattr(
+        scheduling.timezone, "now", lambda: now + timedelta(hours=2)
+    )
+    assert client.get("/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_new_login_invalidates_etag(
+        client, django_user_model, post_with_published_location
+):
+    django_user_model.objects.create_user("reader", password="Passw0rd-1")
+    url = f"/posts/{post_with_published_location.id}/"
+
+    def login():
+        response = client.post(
+            "/auth/login/", {"username": "reader", "password": "Passw0rd-1"}
+        )
+        assert response.status_code == 302
+
+    login()
+    response = client.get(url)
+    assert "csrfmiddlewaretoken" in response.content.decode()
+    etag = response["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    client.post("/auth/logout/")
+    login()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что после повторного входа страница с формой не"
+        " отдаётся из кеша браузера со старым CSRF-токеном."
+    )
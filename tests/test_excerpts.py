@@ -0,0 +1,54 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import EXCERPT_WORDS, Post, make_excerpt
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = " ".join(f"слово{number}" for number in range(EXCERPT_WORDS * 2))
+
+
+def test_editing_text_refreshes_excerpt(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == make_excerpt(LONG_TEXT), (
+        "Убедитесь, что при изменении текста публикации обновляется её"
+        " отрывок."
+    )
+
+    post.text = "Короткий текст"
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt == "Короткий текст", (
+        "Убедитесь, что отрывок обновляется и при сохранении только поля"
+        " text."
+    )
+
+
+def test_saving_other_fields_keeps_excerpt(post_with_published_location):
+    post = post_with_published_location
+    excerpt = post.excerpt
+    Post.objects.filter(pk=post.pk).update(text=LONG_TEXT)
+    post.title = "Новый заголовок"
+    post.save(update_fields=["title"])
+    post.refresh_from_db()
+    assert post.excerpt == excerpt, (
+        "Убедитесь, что сохранение других полей не меняет отрывок."
+    )
+
+
+def test_backfill_excerpts(post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(text=LONG_TEXT, excerpt="")
+    out = StringIO()
+    call_command("backfill_excerpts", batch_size=1, stdout=out)
+    post.refresh_from_db()
+    assert post.excerpt == make_excerpt(LONG_TEXT), (
+        "Убедитесь, что команда backfill_excerpts заполняет пустые отрывки"
+        " существующих публикаций."
+    )
+    assert "Обновлено отрывков: 1" in out.getvalue()
@@ -0,0 +1,79 @@
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def export(*args, **kwargs):
+    out = StringIO()
+    call_command("export_blog", *args, stdout=out, **kwargs)
+    return out.getvalue()
+
+
+def test_export_posts_as_ndjson(many_posts_with_published_locations):
+    rows = [json.loads(line) for line in export("posts").splitlines()]
+    assert [row["id"] for row in rows] == sorted(
+        post.id for post in many_posts_with_published_locations
+    )
+    post = Post.objects.get(pk=rows[0]["id"])
+    assert rows[0]["title"] == post.title
+    assert rows[0]["author_id"] == post.author_id
+    assert rows[0]["updated_at"] == post.updated_at.isoformat()
+
+
+def test_export_comments_as_csv(mixer, post_with_published_location):
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    rows = list(csv.DictReader(StringIO(export("comments", format="csv"))))
+    assert [int(row["id"]) for row in rows] == [c.id for c in comments]
+    assert rows[0]["text"] == comments[0].text
+
+
+def test_export_since(many_posts_with_published_locations):
+    changed = many_posts_with_published_locations[0]
+    Post.objects.update(updated_at=changed.updated_at - timedelta(days=2))
+    changed.save()
+    since = (changed.updated_at - timedelta(days=1)).isoformat()
+    rows = [
+        json.loads(line)
+        for line in export("posts", since=since).splitlines()
+    ]
+    assert [row["id"] for row in rows] == [changed.id], (
+        "Убедитесь, что выгрузка с параметром --since содержит только"
+        " записи, изменённые после указанного момента."
+    )
+
+
+def test_export_view(staff_client, user_client, post_with_published_location):
+    assert user_client.get("/export/posts/").status_code == 302
+    response = staff_client.get("/export/posts/?format=csv")
+    assert response.status_code == 200
+    assert response.streaming, (
+        "Убедитесь, что выгрузка отдаётся потоковым ответом."
+    )
+    assert response["Content-Type"].startswith("text/csv")
+    content = b"".join(response.streaming_content).decode()
+    assert post_with_published_location.title in content
+    assert staff_client.get("/export/users/").status_code == 404
+    assert staff_client.get("/export/posts/?since=nope").status_code == 400
+
+
+@pytest.mark.parametrize("query", [
+    "format=<script>alert(1)</script>",
+    "since=<script>alert(1)</script>",
+])
+def test_export_errors_are_plain_text(staff_client, query):
+    response = staff_client.get(f"/export/posts/?{query}")
+    assert response.status_code == 400
+    assert response["Content-Type"].startswith("text/plain"), (
+        "Убедитесь, что ошибки выгрузки, повторяющие параметры запроса,"
+        " отдаются как обычный текст, а не HTML."
+    )
@@ -0,0 +1,209 @@
+from io import BytesIO, StringIO
+
+import pytest
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.images import rendition_name, strip_metadata
+from blog.models import ImageJob, Post
+from blog.tasks import enqueue_image_job
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def make_upload(width, height, name="photo.jpg"):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(200, 30, 30)).save(
+        buffer, "JPEG"
+    )
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/jpeg")
+
+
+def test_create_post_generates_renditions(
+        user_client, published_category, media_root
+):
+    user_client.post("/posts/create/", {
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%d %H:%M"),
+        "category": published_category.id,
+        "is_published": True,
+        "image": make_upload(1000, 500),
+    })
+    post = Post.objects.get(title="С картинкой")
+    assert post.image_widths == "320,640", (
+        "Убедитесь, что при загрузке изображения создаются его уменьшенные"
+        " копии, не превышающие исходную ширину."
+    )
+    rendition = media_root / rendition_name(post.image.name, 320, "jpg")
+    with Image.open(rendition) as image:
+        assert image.size == (320, 160)
+
+    content = user_client.get("/").content.decode()
+    assert "srcset=" in content and "320w" in content, (
+        "Убедитесь, что в ленте изображение выводится с атрибутом srcset."
+    )
+    assert content.count("<img") == 2
+
+
+def test_generate_renditions_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    assert post.image_widths == ""
+    out = StringIO()
+    call_command("generate_renditions", stdout=out)
+    post.refresh_from_db()
+    assert post.image_widths == "100"
+    assert "Обработано изображений: 1" in out.getvalue()
+
+
+def make_rotated_upload():
+    buffer = BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = "Камера"
+    Image.new("RGB", (400, 200)).save(buffer, "JPEG", exif=exif.tobytes())
+    return SimpleUploadedFile("rotated.jpg", buffer.getvalue(), "image/jpeg")
+
+
+def test_image_job_strips_exif(user, published_category, media_root):
+    post = Post.objects.create(
+        title="Повёрнутая", text="Текст", pub_date=timezone.now(),
+        author=user, category=published_category,
+        image=make_rotated_upload(),
+    )
+    job = enqueue_image_job(post)
+    job.refresh_from_db()
+    assert job.status == ImageJob.DONE, job.error
+    with Image.open(media_root / post.image.name) as image:
+        assert not image.getexif(), (
+            "Убедитесь, что из исходного изображения удаляются данные EXIF."
+        )
+        assert image.size == (200, 400)
+    post.refresh_from_db()
+    assert post.image_widths == "200"
+
+
+def test_stripped_image_keeps_name_taken_meanwhile(
+        monkeypatch, user, published_category, media_root
+):
+    post = Post.objects.create(
+        title="Повёрнутая", text="Текст", pub_date=timezone.now(),
+        author=user, category=published_category,
+        image=make_rotated_upload(),
+    )
+    taken = post.image.name
+    storage = post.image.storage
+    delete = storage.delete
+
+    def delete_and_upload(name):
+        delete(name)
+        (media_root / name).write_bytes(b"another upload")
+
+    monkeypatch.setattr(storage, "delete", delete_and_upload)
+    assert strip_metadata(post)
+    monkeypatch.undo()
+    post.refresh_from_db()
+    assert post.image.name != taken, (
+        "Убедитесь, что публикация ссылается на имя, под которым хранилище"
+        " сохранило изображение без EXIF."
+    )
+    with Image.open(media_root / post.image.name) as image:
+        assert not image.getexif()
+    assert (media_root / taken).read_bytes() == b"another upload"
+
+
+def test_deleting_post_deletes_renditions(
+        user_client, published_category, media_root
+):
+    user_client.post("/posts/create/", {
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%d %H:%M"),
+        "category": published_category.id,
+        "is_published": True,
+        "image": make_upload(1000, 500),
+    })
+    post = Post.objects.get(title="С картинкой")
+    rendition = media_root / rendition_name(post.image.name, 320, "jpg")
+    assert rendition.exists()
+    post.delete()
+    assert not rendition.exists(), (
+        "Убедитесь, что при удалении публикации удаляются копии её"
+        " изображения."
+    )
+
+
+def test_worker_mode_leaves_jobs_to_command(
+        settings, user, published_category
+):
+    settings.BLOG_IMAGE_JOBS_MODE = "worker"
+    post = Post.objects.create(
+        title="В очереди", text="Текст", pub_date=timezone.now(),
+        author=user, category=published_category, image=make_upload(50, 50),
+    )
+    job = enqueue_image_job(post)
+    assert job.status == ImageJob.PENDING
+
+    call_command("process_image_jobs", "--once", stdout=StringIO())
+    job.refresh_from_db()
+    post.refresh_from_db()
+    assert job.status == ImageJob.DONE and job.attempts == 1
+    assert post.image_widths == "50"
+
+
+def test_failed_job_is_reported(user, published_category):
+    post = Post.objects.create(
+        title="Битая", text="Текст", pub_date=timezone.now(),
+        author=user, category=published_category,
+        image=SimpleUploadedFile("broken.jpg", b"not an image"),
+    )
+    job = enqueue_image_job(post)
+    job.refresh_from_db()
+    assert job.status == ImageJob.FAILED
+    assert "UnidentifiedImageError" in job.error
+
+
+def test_replacing_image_drops_old_renditions(
+        user_client, published_category, media_root, settings
+):
+    user_client.post("/posts/create/", {
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%d %H:%M"),
+        "category": published_category.id,
+        "is_published": True,
+        "image": make_upload(1000, 500, "first.jpg"),
+    })
+    post = Post.objects.get(title="С картинкой")
+    old_rendition = media_root / rendition_name(post.image.name, 320, "jpg")
+    assert old_rendition.exists()
+
+    settings.BLOG_IMAGE_JOBS_MODE = "worker"
+    user_client.post(f"/posts/{post.id}/edit/", {
+        "title": post.title,
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%d %H:%M"),
+        "category": published_category.id,
+        "is_published": True,
+        "image": make_upload(300, 150, "second.jpg"),
+    })
+    post.refresh_from_db()
+    assert post.image.name.endswith("second.jpg")
+    assert post.image_widths == "", (
+        "Убедитесь, что при замене изображения сбрасываются размеры копий"
+        " прежнего изображения."
+    )
+    assert not old_rendition.exists(), (
+        "Убедитесь, что при замене изображения удаляются копии прежнего."
+    )
+    assert "srcset=" not in user_client.get(
+        f"/posts/{post.id}/"
+    ).content.decode()
@@ -0,0 +1,68 @@
+import pytest
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.exceptions import ValidationError
+
+from blog.lookups import (
+    CachedModelChoiceField, get_category, lookup_table, table_version_key
+)
+from blog.models import Category, Location
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_lookup_table_is_reused(django_assert_num_queries, published_category):
+    lookup_table(Category)
+    with django_assert_num_queries(0):
+        assert get_category(published_category.slug) == published_category
+
+
+def test_lookup_table_follows_saves(published_category):
+    lookup_table(Category)
+    published_category.title = "Новое название"
+    published_category.save()
+    assert get_category(published_category.slug).title == "Новое название", (
+        "Убедитесь, что кеш категорий сбрасывается при их изменении."
+    )
+
+
+def test_lookup_table_follows_shared_version(settings, published_location):
+    lookup_table(Location)
+    Location.objects.filter(pk=published_location.pk).update(name="Где-то")
+    assert lookup_table(Location)[published_location.pk].name != "Где-то"
+    other_process_cache = FileBasedCache(
+        settings.CACHES["default"]["LOCATION"], {}
+    )
+    other_process_cache.delete(table_version_key(Location))
+    assert lookup_table(Location)[published_location.pk].name == "Где-то", (
+        "Убедитесь, что кеш местоположений перезагружается, когда другой"
+        " процесс меняет общую версию."
+    )
+
+
+def test_post_form_choices_come_from_cache(
+        user_client, django_assert_num_queries,
+        published_category, published_location
+):
+    user_client.get("/posts/create/")
+    with django_assert_num_queries(1):
+        content = user_client.get("/posts/create/").content.decode()
+    assert published_category.title in content
+    assert published_location.name in content
+
+
+def test_narrowed_choice_field_skips_unlisted_rows(
+        published_category, another_category
+):
+    Category.objects.filter(pk=another_category.pk).update(is_published=False)
+    lookup_table(Category)
+    field = CachedModelChoiceField(
+        queryset=Category.objects.filter(is_published=True)
+    )
+    choices = [value for value, _ in field.choices if value]
+    assert choices == [published_category.pk], (
+        "Убедитесь, что поле выбора с суженным queryset не показывает"
+        " строки, которые в него не входят."
+    )
+    assert field.clean(published_category.pk) == published_category
+    with pytest.raises(ValidationError):
+        field.clean(another_category.pk)
@@ -0,0 +1,59 @@
+import logging
+import re
+
+import pytest
+
+from blog import metrics
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_metrics_are_collected_per_view(
+        client, staff_client, post_with_published_location
+):
+    client.get("/")
+    client.get(f"/posts/{post_with_published_location.id}/")
+    response = staff_client.get("/metrics/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    content = response.content.decode()
+    for view in ("blog.views.Index", "blog.views.PostDetail"):
+        assert (
+            f'blog_request_duration_seconds_count{{view="{view}"}} 1'
+            in content
+        ), (
+            "Убедитесь, что метрики собираются для каждого представления"
+            f" отдельно: {view}"
+        )
+        assert f'blog_request_queries_bucket{{view="{view}"' in content
+        assert f'blog_response_bytes_total{{view="{view}"}}' in content
+        render_time = re.search(
+            rf'blog_request_render_seconds_total{{view="{view}"}} (\S+)',
+            content
+        ).group(1)
+        assert float(render_time) > 0
+
+
+def test_metrics_are_staff_only(user_client):
+    response = user_client.get("/metrics/")
+    assert response.status_code == 302
+
+
+def test_budget_overruns_are_logged(
+        client, settings, caplog, post_with_published_location
+):
+    settings.BLOG_METRICS_BUDGETS = {"queries": 0}
+    with caplog.at_level(logging.WARNING, logger="blog.metrics"):
+        client.get(f"/posts/{post_with_published_location.id}/")
+    assert "blog.views.PostDetail" in caplog.text, (
+        "Убедитесь, что запросы, превысившие бюджет, попадают в журнал"
+        " с именем класса представления."
+    )
+    assert "queries=" in caplog.text
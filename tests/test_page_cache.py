@@ -0,0 +1,132 @@
+import pytest
+from django.test import Client
+
+from blogicum.cache_backends import ThrottledFileBasedCache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def page_urls(post):
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    ]
+
+
+def test_anonymous_pages_are_cached(
+        client, django_assert_num_queries, post_with_published_location
+):
+    for url in page_urls(post_with_published_location):
+        response = client.get(url)
+        assert response["X-Cache"] == "MISS"
+        with django_assert_num_queries(0):
+            cached = client.get(url)
+        assert cached["X-Cache"] == "HIT", (
+            "Убедитесь, что страницы для анонимных посетителей берутся из"
+            f" кеша: {url}"
+        )
+        assert cached.content == response.content
+
+
+def test_page_cache_keyed_on_query_string(
+        client, many_posts_with_published_locations
+):
+    client.get("/")
+    response = client.get("/?cursor=bad")
+    assert response["X-Cache"] == "MISS"
+
+
+def test_content_changes_invalidate_pages(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    for url in page_urls(post):
+        client.get(url)
+    mixer.blend("blog.Comment", post=post)
+    for url in page_urls(post):
+        assert client.get(url)["X-Cache"] == "MISS", (
+            "Убедитесь, что изменение содержимого сбрасывает кеш страниц:"
+            f" {url}"
+        )
+
+    post.title = "Новый заголовок"
+    post.save()
+    content = client.get(f"/posts/{post.id}/").content.decode()
+    assert "Новый заголовок" in content
+
+
+def test_comments_only_invalidate_pages_of_their_post(
+        client, mixer, another_user, another_category,
+        post_with_published_location
+):
+    post = post_with_published_location
+    other_post = mixer.blend(
+        "blog.Post", is_published=True, author=another_user,
+        category=another_category, location=None,
+    )
+    for url in page_urls(post):
+        client.get(url)
+    mixer.blend("blog.Comment", post=other_post)
+    for url in page_urls(post)[1:]:
+        assert client.get(url)["X-Cache"] == "HIT", (
+            "Убедитесь, что комментарий к другой публикации не сбрасывает"
+            f" кеш страницы: {url}"
+        )
+    assert client.get("/")["X-Cache"] == "MISS"
+
+
+def test_authenticated_users_bypass_cache(
+        user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    for _ in range(2):
+        response = user_client.get(url)
+        assert "X-Cache" not in response, (
+            "Убедитесь, что страницы авторизованных пользователей не"
+            " кешируются."
+        )
+        assert "csrfmiddlewaretoken" in response.content.decode()
+
+
+def test_logins_keep_pages_cached(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    author = post.author
+    client.get("/")
+    Client().force_login(author)
+    author.set_password("N3w-passw0rd")
+    author.save(update_fields=["password"])
+    assert client.get("/")["X-Cache"] == "HIT", (
+        "Убедитесь, что вход пользователя и смена пароля не сбрасывают кеш"
+        " страниц."
+    )
+
+    author.username = "renamed-author"
+    author.save()
+    response = client.get("/")
+    assert response["X-Cache"] == "MISS"
+    assert "@renamed-author" in response.content.decode(), (
+        "Убедитесь, что смена имени пользователя сбрасывает кеш страниц и"
+        " карточек его публикаций."
+    )
+
+
+def test_file_cache_lists_directory_once_per_interval(tmp_path, monkeypatch):
+    pages = ThrottledFileBasedCache(str(tmp_path), {
+        "OPTIONS": {"MAX_ENTRIES": 10, "CULL_INTERVAL": 60},
+    })
+    listings = []
+    list_files = pages._list_cache_files
+    monkeypatch.setattr(
+        pages, "_list_cache_files",
+        lambda: listings.append(1) or list_files()
+    )
+    for number in range(20):
+        pages.set(f"page-{number}", number)
+    assert len(listings) == 1, (
+        "Убедитесь, что файловый кеш не просматривает каталог при каждой"
+        " записи."
+    )
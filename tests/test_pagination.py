@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from blog.paginators import KeysetPaginator
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts_with_equal_pub_dates(mixer, user, published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_date,
+    )
+
+
+def collect_pages(paginator, direction="next_cursor", cursor=None):
+    pages = []
+    while True:
+        page = paginator.get_page(cursor)
+        pages.append([post.id for post in page])
+        cursor = getattr(page, direction)
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_cover_all_posts(posts_with_equal_pub_dates):
+    paginator = KeysetPaginator(Post.objects.all(), N_PER_PAGE)
+    pages = collect_pages(paginator)
+    ids = [post_id for page in pages for post_id in page]
+    expected = sorted(
+        (post.id for post in posts_with_equal_pub_dates), reverse=True
+    )
+    assert ids == expected, (
+        "Убедитесь, что постраничная навигация по курсору выдаёт все"
+        " публикации ровно один раз, даже при совпадающих датах публикации."
+    )
+    assert [len(page) for page in pages] == [N_PER_PAGE, N_PER_PAGE, 5]
+
+
+def test_keyset_previous_pages(posts_with_equal_pub_dates):
+    paginator = KeysetPaginator(Post.objects.all(), N_PER_PAGE)
+    ids = [post_id for page in collect_pages(paginator) for post_id in page]
+    last_page = paginator.get_page(paginator.get_page().last_cursor)
+    assert [post.id for post in last_page] == ids[-N_PER_PAGE:]
+    assert not last_page.has_next()
+    backward = collect_pages(
+        paginator, "previous_cursor", last_page.previous_cursor
+    )
+    assert [post_id for page in backward[::-1] for post_id in page] == (
+        ids[:-N_PER_PAGE]
+    ), (
+        "Убедитесь, что ссылки на предыдущую страницу позволяют пройти все"
+        " публикации в обратном порядке."
+    )
+
+
+def test_invalid_cursor_falls_back_to_first_page(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get("/?cursor=not-a-cursor")
+    assert response.status_code == 200
+    first_page = user_client.get("/")
+    assert (
+        [post.id for post in response.context["page_obj"]]
+        == [post.id for post in first_page.context["page_obj"]]
+    )
+
+
+def test_feed_next_link(user_client, many_posts_with_published_locations):
+    response = user_client.get("/")
+    page_obj = response.context["page_obj"]
+    assert page_obj.has_next() and not page_obj.has_previous()
+    assert f"?cursor={page_obj.next_cursor}" in response.content.decode()
+    next_page = user_client.get(f"/?cursor={page_obj.next_cursor}")
+    next_ids = {post.id for post in next_page.context["page_obj"]}
+    assert next_ids.isdisjoint(post.id for post in page_obj)
+    assert len(next_ids) == N_PER_PAGE
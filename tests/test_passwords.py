@@ -0,0 +1,142 @@
+import pytest
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import Client
+
+pytestmark = [pytest.mark.django_db]
+
+PASSWORD = "Sup3r-secret-passw0rd"
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashing(settings):
+    settings.BLOG_SCRYPT_COST = {
+        "work_factor": 2 ** 10, "block_size": 8, "parallelism": 1
+    }
+    settings.BLOG_AUTH_RATE_LIMITS = {"ip": 5, "username": 3}
+
+
+@pytest.fixture
+def login_user(django_user_model):
+    return django_user_model.objects.create_user(
+        "login-user", password=PASSWORD
+    )
+
+
+def login(client, username, password=PASSWORD, ip="10.0.0.1"):
+    return client.post(
+        "/auth/login/",
+        {"username": username, "password": password},
+        REMOTE_ADDR=ip,
+    )
+
+
+def test_scrypt_is_default_hasher(login_user):
+    assert login_user.password.startswith("scrypt$1024$"), (
+        "Убедитесь, что новые пароли хешируются алгоритмом scrypt."
+    )
+    assert login_user.check_password(PASSWORD)
+    assert not login_user.check_password("wrong")
+
+
+def test_scrypt_cost_change_needs_update(settings):
+    encoded = make_password(PASSWORD)
+    settings.BLOG_SCRYPT_COST = {
+        "work_factor": 2 ** 11, "block_size": 8, "parallelism": 1
+    }
+    updated = []
+    assert check_password(PASSWORD, encoded, updated.append)
+    assert updated == [PASSWORD]
+
+
+def test_old_hash_is_upgraded_on_login(login_user):
+    login_user.password = make_password(PASSWORD, hasher="pbkdf2_sha256")
+    login_user.save()
+    response = login(Client(), login_user.username)
+    assert response.status_code == 302
+    login_user.refresh_from_db()
+    assert login_user.password.startswith("scrypt$"), (
+        "Убедитесь, что пароль со старым хешем перехешируется при входе."
+    )
+
+
+def test_login_is_rate_limited_per_username(login_user):
+    client = Client()
+    for attempt in range(3):
+        assert login(
+            client, login_user.username, "wrong"
+        ).status_code == 200
+    response = login(client, login_user.username)
+    assert response.status_code == 429, (
+        "Убедитесь, что число попыток входа под одним именем ограничено."
+    )
+    assert int(response["Retry-After"]) > 0
+    assert login(
+        client, login_user.username, ip="10.0.0.9"
+    ).status_code == 302, (
+        "Убедитесь, что неудачные попытки с одного адреса не блокируют"
+        " вход в чужую учётную запись с других адресов."
+    )
+
+
+def test_empty_usernames_do_not_share_a_bucket(settings):
+    settings.BLOG_AUTH_RATE_LIMITS = {"ip": 5, "username": 1}
+    for attempt in range(3):
+        login(Client(), "", ip=f"10.0.1.{attempt}")
+    assert login(Client(), "", ip="10.0.1.9").status_code == 200, (
+        "Убедитесь, что запросы без имени пользователя не расходуют общий"
+        " лимит попыток."
+    )
+
+
+def test_login_is_rate_limited_per_ip(login_user):
+    client = Client()
+    for attempt in range(5):
+        login(client, f"user-{attempt}", "wrong")
+    assert login(client, login_user.username).status_code == 429, (
+        "Убедитесь, что число попыток входа с одного адреса ограничено."
+    )
+    assert login(
+        client, login_user.username, ip="10.0.0.2"
+    ).status_code == 302
+
+
+def test_login_is_rate_limited_per_forwarded_ip(settings, login_user):
+    settings.BLOG_TRUSTED_PROXIES = 1
+    client = Client()
+    for attempt in range(5):
+        client.post(
+            "/auth/login/",
+            {"username": f"user-{attempt}", "password": "wrong"},
+            REMOTE_ADDR="10.0.0.1",
+            HTTP_X_FORWARDED_FOR=f"198.51.100.{attempt}, 203.0.113.7",
+        )
+    response = client.post(
+        "/auth/login/",
+        {"username": login_user.username, "password": PASSWORD},
+        REMOTE_ADDR="10.0.0.1",
+        HTTP_X_FORWARDED_FOR="203.0.113.7",
+    )
+    assert response.status_code == 429, (
+        "Убедитесь, что за доверенным прокси попытки входа считаются по"
+        " адресу из X-Forwarded-For, добавленному прокси, а не по"
+        " подставленным клиентом значениям."
+    )
+    response = login(client, login_user.username, ip="10.0.0.1")
+    assert response.status_code == 302, (
+        "Убедитесь, что клиенты за одним прокси не делят общий лимит."
+    )
+
+
+def test_registration_is_rate_limited():
+    client = Client()
+    for attempt in range(5):
+        client.post("/auth/registration/", {"username": f"new-{attempt}"})
+    response = client.post("/auth/registration/", {
+        "username": "new-user",
+        "password1": PASSWORD,
+        "password2": PASSWORD,
+    })
+    assert response.status_code == 429, (
+        "Убедитесь, что число попыток регистрации с одного адреса ограничено."
+    )
+    assert client.get("/auth/registration/").status_code == 200
@@ -0,0 +1,69 @@
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=["locmem", "filebased"])
+def card_cache(request, tmp_path):
+    backends = {
+        "locmem": "django.core.cache.backends.locmem.LocMemCache",
+        "filebased": "django.core.cache.backends.filebased.FileBasedCache",
+    }
+    with override_settings(CACHES={
+        alias: {
+            "BACKEND": backends[request.param],
+            "LOCATION": str(tmp_path / alias),
+        }
+        for alias in ("default", "pages")
+    }):
+        yield caches["pages"]
+        for alias in ("default", "pages"):
+            caches[alias].clear()
+
+
+def test_post_card_is_cached_and_invalidated(
+        card_cache, client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/category/{post.category.slug}/"
+    assert post.title in client.get(url).content.decode()
+
+    Post.objects.filter(pk=post.pk).update(title="Обновлено в обход")
+    assert post.title in client.get(url).content.decode(), (
+        "Убедитесь, что карточка публикации берётся из кеша."
+    )
+
+    post.refresh_from_db()
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in client.get(url).content.decode(), (
+        "Убедитесь, что кеш карточки сбрасывается при сохранении публикации."
+    )
+
+    post.category.title = "Новая категория"
+    post.category.save()
+    mixer.blend("blog.Comment", post=post)
+    content = client.get(url).content.decode()
+    assert "Новая категория" in content and "Комментарии (1)" in content, (
+        "Убедитесь, что кеш карточки сбрасывается при изменении категории"
+        " и комментариев."
+    )
+
+
+def test_post_card_cache_can_be_disabled(
+        client, settings, post_with_published_location
+):
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    settings.BLOG_POST_CARD_CACHE_TIMEOUT = 0
+    post = post_with_published_location
+    url = f"/category/{post.category.slug}/"
+    client.get(url)
+    Post.objects.filter(pk=post.pk).update(title="Обновлено в обход")
+    assert "Обновлено в обход" in client.get(url).content.decode(), (
+        "Убедитесь, что при BLOG_POST_CARD_CACHE_TIMEOUT = 0 карточки"
+        " публикаций не кешируются."
+    )
@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import scheduling
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def render_every_page(settings):
+    # These tests look at rendered pages, which cache hits would replace.
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+
+
+def feed_ids(client):
+    return {post.id for post in client.get("/").context["page_obj"]}
+
+
+def test_scheduled_post_appears_when_its_time_comes(
+        client, monkeypatch, mixer, user, published_category
+):
+    now = timezone.now()
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(hours=1),
+    )
+    assert scheduled.id not in feed_ids(client), (
+        "Убедитесь, что отложенные публикации не видны в ленте раньше срока."
+    )
+
+    monkeypatch.setattr(
+        scheduling.timezone, "now", lambda: now + timedelta(minutes=30)
+    )
+    assert scheduled.id not in feed_ids(client)
+
+    monkeypatch.setattr(
+        scheduling.timezone, "now", lambda: now + timedelta(hours=2)
+    )
+    assert scheduled.id in feed_ids(client), (
+        "Убедитесь, что отложенная публикация появляется в ленте, когда"
+        " наступает её время, без перезапуска сервера."
+    )
+
+
+def test_horizon_is_reused_between_releases(
+        django_assert_num_queries, post_with_published_location
+):
+    scheduling.reset_publish_horizon()
+    cutoff = scheduling.publish_horizon()
+    with django_assert_num_queries(0):
+        assert scheduling.publish_horizon() == cutoff
+
+    Post.objects.create(
+        title="Новый", text="Текст", pub_date=timezone.now(),
+        author=post_with_published_location.author,
+        category=post_with_published_location.category,
+    )
+    assert scheduling.publish_horizon() > cutoff, (
+        "Убедитесь, что сохранение публикации сдвигает границу публикации."
+    )
+
+
+def test_horizon_picks_up_posts_saved_by_other_processes(
+        monkeypatch, user, published_category
+):
+    scheduling.reset_publish_horizon()
+    now = timezone.now()
+    cutoff = scheduling.publish_horizon()
+    # Another process saves a post: no signal reaches this one.
+    Post.objects.bulk_create([Post(
+        title="Новый", text="Текст", author=user,
+        category=published_category, pub_date=now + timedelta(seconds=1),
+    )])
+
+    monkeypatch.setattr(
+        scheduling.timezone, "now", lambda: now + timedelta(seconds=5)
+    )
+    assert scheduling.publish_horizon() == cutoff
+
+    later = now + timedelta(minutes=5)
+    monkeypatch.setattr(scheduling.timezone, "now", lambda: later)
+    assert scheduling.publish_horizon() == later, (
+        "Убедитесь, что граница публикации периодически сверяется с базой"
+        " и учитывает публикации, сохранённые другими процессами."
+    )
+
+
+def test_horizon_is_kept_when_nothing_was_published(monkeypatch):
+    scheduling.reset_publish_horizon()
+    now = timezone.now()
+    cutoff = scheduling.publish_horizon()
+    monkeypatch.setattr(
+        scheduling.timezone, "now", lambda: now + timedelta(minutes=5)
+    )
+    assert scheduling.publish_horizon() == cutoff
+
+
+def test_post_page_follows_feed_horizon(
+        client, mixer, user, published_category
+):
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(minutes=1),
+    )
+    feed_ids(client)
+    # Published after the cached cutoff without a save signal, as another
+    # process would: feeds keep hiding it until the horizon is refreshed.
+    Post.objects.filter(pk=scheduled.pk).update(pub_date=timezone.now())
+    assert scheduled.id not in feed_ids(client)
+    assert client.get(f"/posts/{scheduled.id}/").status_code == 404, (
+        "Убедитесь, что страница публикации и лента одинаково решают,"
+        " опубликована ли запись."
+    )
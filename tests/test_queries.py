@@ -0,0 +1,88 @@
+import pytest
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def render_every_page(settings):
+    # These tests look at rendered pages, which cache hits would replace.
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+
+
+@pytest.fixture
+def commented_posts(mixer, many_posts_with_published_locations):
+    for post in many_posts_with_published_locations:
+        mixer.cycle(3).blend("blog.Comment", post=post)
+    return many_posts_with_published_locations
+
+
+@pytest.mark.parametrize(
+    ("url_template", "expected_queries"),
+    [
+        ("/", 1),
+        ("/category/{post.category.slug}/", 1),
+        ("/profile/{post.author.username}/", 2),
+    ],
+    ids=["index", "category", "profile"],
+)
+def test_feed_page_query_count(
+        client, django_assert_num_queries, commented_posts,
+        url_template, expected_queries
+):
+    url = url_template.format(post=commented_posts[0])
+    client.get(url)
+    with django_assert_num_queries(expected_queries):
+        response = client.get(url)
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+    assert "Комментарии (3)" in response.content.decode(), (
+        "Убедитесь, что в ленте отображается количество комментариев."
+    )
+
+
+def test_feed_does_not_load_comments(
+        client, django_assert_max_num_queries, commented_posts
+):
+    client.get("/")
+    with django_assert_max_num_queries(1) as captured:
+        client.get("/")
+    assert all("blog_comment" not in q["sql"] for q in captured), (
+        "Убедитесь, что страницы ленты не загружают комментарии к постам."
+    )
+
+
+def test_feed_defers_post_text(
+        client, django_assert_max_num_queries, commented_posts
+):
+    post = max(commented_posts, key=lambda item: item.pub_date)
+    client.get("/")
+    with django_assert_max_num_queries(1) as captured:
+        content = client.get("/").content.decode()
+    assert all('"blog_post"."text"' not in q["sql"] for q in captured), (
+        "Убедитесь, что страницы ленты не загружают полный текст публикаций."
+    )
+    assert post.excerpt and post.excerpt in content
+
+
+@pytest.mark.parametrize(
+    ("client_fixture", "expected_queries"),
+    [("client", 2), ("user_client", 3)],
+    ids=["anonymous", "author"],
+)
+def test_post_detail_query_count(
+        request, django_assert_num_queries, mixer,
+        post_with_published_location, client_fixture, expected_queries
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    client = request.getfixturevalue(client_fixture)
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    with django_assert_num_queries(expected_queries):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert len(response.context["comments"]) == 5, (
+        "Убедитесь, что на странице публикации отображаются все комментарии"
+        " к ней."
+    )
@@ -0,0 +1,125 @@
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.utils import timezone
+
+from blog.cache import CONTENT_VERSION_KEY, bump_versions, version_key
+from blog.lookups import lookup_table
+from blog.models import Category, Post
+from blog.routers import STICKY_COOKIE, ReplicaRouter, _use_replica
+
+pytestmark = [pytest.mark.django_db(databases=["default", "replica"])]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def replica(django_db_setup, django_db_blocker, tmp_path_factory):
+    connections.databases["replica"] = {
+        **connections.databases["default"],
+        "NAME": str(tmp_path_factory.mktemp("replica") / "db.sqlite3"),
+    }
+    with django_db_blocker.unblock():
+        call_command("migrate", database="replica", verbosity=0)
+    yield "replica"
+    connections["replica"].close()
+    del connections["replica"]
+    del connections.databases["replica"]
+
+
+@pytest.fixture(autouse=True)
+def route_to_replica(settings):
+    settings.BLOG_REPLICA_DATABASES = ["replica"]
+
+
+@pytest.fixture
+def replica_post(django_user_model):
+    author = django_user_model.objects.db_manager("replica").create_user(
+        "replica-author"
+    )
+    category = Category.objects.using("replica").create(
+        title="Реплика", description="Реплика", slug="replica"
+    )
+    return Post.objects.using("replica").create(
+        title="Пост только на реплике", text="Текст", author=author,
+        category=category, pub_date=timezone.now()
+    )
+
+
+def test_read_only_views_use_replica(client, replica_post):
+    assert not Post.objects.using("default").filter(
+        title=replica_post.title
+    ).exists()
+    response = client.get("/")
+    assert replica_post.title in response.content.decode(), (
+        "Убедитесь, что главная страница читает данные из реплики."
+    )
+
+
+def test_writes_go_to_primary():
+    router = ReplicaRouter()
+    assert router.db_for_write(Post) == "default"
+
+
+def test_author_reads_primary_after_write(
+        user_client, post_with_published_location, replica_post
+):
+    response = user_client.post(
+        f"/posts/{post_with_published_location.id}/comment/",
+        data={"text": "Комментарий"},
+    )
+    assert STICKY_COOKIE in response.cookies, (
+        "Убедитесь, что после изменения данных пользователь получает cookie,"
+        " закрепляющую его чтения за основной базой."
+    )
+    response = user_client.get("/")
+    content = response.content.decode()
+    assert post_with_published_location.title in content, (
+        "Убедитесь, что после изменения данных автор видит страницы,"
+        " прочитанные из основной базы."
+    )
+    assert replica_post.title not in content
+
+
+def test_lookup_tables_are_loaded_from_primary(
+        published_category, replica_post
+):
+    bump_versions(version_key("table", "category"))
+    token = _use_replica.set(True)
+    try:
+        categories = lookup_table(Category)
+    finally:
+        _use_replica.reset(token)
+    assert published_category.pk in categories
+    assert all(
+        category.slug != "replica" for category in categories.values()
+    ), (
+        "Убедитесь, что общий кеш категорий загружается из основной базы,"
+        " а не из реплики."
+    )
+
+
+def test_lagging_replica_pages_are_not_cached(
+        client, settings, replica_post
+):
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 60
+    bump_versions(CONTENT_VERSION_KEY)
+    client.get("/")
+    assert client.get("/")["X-Cache"] == "MISS", (
+        "Убедитесь, что страницы, прочитанные из реплики сразу после"
+        " изменения данных, не попадают в кеш."
+    )
+    settings.BLOG_REPLICA_STICKINESS = 0
+    client.get("/")
+    assert client.get("/")["X-Cache"] == "HIT"
+
+
+def test_lagging_replica_post_cards_are_not_cached(client, replica_post):
+    bump_versions(version_key("post", replica_post.pk))
+    client.get("/")
+    Post.objects.using("replica").filter(pk=replica_post.pk).update(
+        title="Реплика догнала основную базу"
+    )
+    content = client.get("/").content.decode()
+    assert "Реплика догнала основную базу" in content, (
+        "Убедитесь, что карточки публикаций, прочитанные из реплики сразу"
+        " после изменения данных, не попадают в кеш."
+    )
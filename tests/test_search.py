@@ -0,0 +1,109 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import SearchTerm
+from blog.search import POST_TABLE, use_fts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=["fts5", "python"])
+def search_backend(request, settings):
+    settings.BLOG_SEARCH_BACKEND = request.param
+    return request.param
+
+
+@pytest.fixture
+def searchable_posts(search_backend, mixer, user, published_category):
+    def blend(title, text, **kwargs):
+        fields = {
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **kwargs,
+        }
+        return mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            title=title, text=text, **fields
+        )
+
+    return {
+        "walrus": blend("Морж на льдине", "Видели моржа у берега."),
+        "harbour": blend("Порт", "Ледокол заходит в порт на рассвете."),
+        "hidden": blend("Ледокол в ремонте", "Текст", is_published=False),
+        "future": blend(
+            "Ледокол", "Скоро", pub_date=timezone.now() + timedelta(days=1)
+        ),
+    }
+
+
+def found_ids(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return {post.id for post in response.context["page_obj"]}
+
+
+def test_search_respects_visibility(client, searchable_posts):
+    assert found_ids(client, "ледокол") == {
+        searchable_posts["harbour"].id
+    }, (
+        "Убедитесь, что поиск находит только опубликованные публикации."
+    )
+    assert found_ids(client, "МОРЖ льдине") == {
+        searchable_posts["walrus"].id
+    }
+    assert found_ids(client, "морж порт") == set(), (
+        "Убедитесь, что поиск находит публикации, содержащие все слова"
+        " запроса."
+    )
+    assert found_ids(client, "") == set()
+
+
+def test_search_is_updated_incrementally(client, mixer, searchable_posts):
+    walrus = searchable_posts["walrus"]
+    comment = mixer.blend("blog.Comment", post=walrus, text="Огромный бивень")
+    assert found_ids(client, "бивень") == {walrus.id}, (
+        "Убедитесь, что поиск учитывает текст комментариев."
+    )
+
+    comment.delete()
+    assert found_ids(client, "бивень") == set()
+
+    walrus.title = "Тюлень"
+    walrus.save()
+    assert found_ids(client, "тюлень") == {walrus.id}
+    assert found_ids(client, "льдине") == set()
+
+    walrus.delete()
+    assert found_ids(client, "тюлень") == set()
+
+
+def test_search_pagination_keeps_query(
+        client, search_backend, many_posts_with_published_locations
+):
+    for post in many_posts_with_published_locations:
+        post.title = f"Пингвин {post.title}"
+        post.save()
+    response = client.get("/search/", {"q": "пингвин"})
+    page_obj = response.context["page_obj"]
+    assert page_obj.has_next()
+    assert f"?q=%D0%BF%D0%B8%D0%BD%D0%B3%D0%B2%D0%B8%D0%BD&amp;cursor=" \
+        f"{page_obj.next_cursor}" in response.content.decode(), (
+            "Убедитесь, что ссылки пагинатора сохраняют поисковый запрос."
+        )
+
+
+def test_rebuild_search_index(client, searchable_posts):
+    if use_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {POST_TABLE}")
+    else:
+        SearchTerm.objects.all().delete()
+    assert found_ids(client, "морж") == set()
+
+    call_command("rebuild_search_index", stdout=StringIO())
+    assert found_ids(client, "морж") == {searchable_posts["walrus"].id}
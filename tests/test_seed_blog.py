@@ -0,0 +1,56 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def seeded():
+    call_command(
+        "seed_blog", users=30, categories=5, locations=4, posts=300,
+        comments=3000, batch_size=64, scheduled=0.1, unpublished=0.1,
+        stdout=StringIO(),
+    )
+
+
+def test_seed_blog_creates_requested_rows(seeded):
+    assert (
+        User.objects.count(), Category.objects.count(),
+        Location.objects.count(), Post.objects.count(),
+        Comment.objects.count(),
+    ) == (30, 5, 4, 300, 3000)
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists()
+    assert Post.objects.filter(is_published=False).exists()
+    assert not Post.objects.filter(excerpt="").exists()
+
+
+def test_seed_blog_comment_popularity_is_skewed(seeded):
+    counts = sorted(
+        Post.objects.values_list("comment_count", flat=True), reverse=True
+    )
+    assert sum(counts) == 3000, (
+        "Убедитесь, что количество комментариев публикаций заполняется"
+        " после генерации."
+    )
+    assert counts[0] > 10 * counts[len(counts) // 2], (
+        "Убедитесь, что комментарии распределяются между публикациями"
+        " неравномерно, по закону Ципфа."
+    )
+    stored = dict(Post.objects.values_list("pk", "comment_count"))
+    actual = dict(
+        Comment.objects.order_by().values("post").annotate(
+            n=Count("pk")
+        ).values_list("post", "n")
+    )
+    assert all(stored[pk] == n for pk, n in actual.items())
+
+
+def test_seeded_posts_are_visible(client, seeded):
+    response = client.get("/")
+    assert len(response.context["page_obj"]) == 10
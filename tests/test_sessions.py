@@ -0,0 +1,87 @@
+from datetime import timedelta
+from importlib.util import find_spec, module_from_spec
+from io import StringIO
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def load_settings(monkeypatch, **environ):
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    spec = find_spec("blogicum.settings")
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def session_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+    return [
+        query["sql"] for query in queries
+        if "django_session" in query["sql"]
+    ]
+
+
+def test_cached_sessions_skip_database(settings, user):
+    settings.SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    client = Client()
+    client.force_login(user)
+    assert session_queries(client, f"/profile/{user.username}/") == [], (
+        "Убедитесь, что при кешированных сессиях страницы не обращаются к"
+        " таблице сессий."
+    )
+
+
+def test_signed_cookie_sessions(settings, user):
+    settings.SESSION_ENGINE = (
+        "django.contrib.sessions.backends.signed_cookies"
+    )
+    client = Client()
+    client.force_login(user)
+    assert not Session.objects.exists()
+    assert session_queries(client, f"/profile/{user.username}/") == []
+    response = client.get("/profile/")
+    assert response.url == f"/profile/{user.username}/", (
+        "Убедитесь, что сессии в подписанных cookie сохраняют вход"
+        " пользователя."
+    )
+
+
+def test_purge_sessions(mixer):
+    now = timezone.now()
+    mixer.cycle(5).blend(Session, expire_date=now - timedelta(days=1))
+    fresh = mixer.blend(Session, expire_date=now + timedelta(days=1))
+    out = StringIO()
+    call_command("purge_sessions", batch_size=2, stdout=out)
+    assert list(Session.objects.all()) == [fresh], (
+        "Убедитесь, что команда purge_sessions удаляет только истёкшие"
+        " сессии."
+    )
+    assert "Истёкших сессий удалено: 5" in out.getvalue()
+
+
+def test_cached_sessions_need_shared_cache(monkeypatch):
+    monkeypatch.delenv("BLOG_SESSION_MODE", raising=False)
+    assert load_settings(
+        monkeypatch, BLOG_CACHE="file"
+    ).BLOG_SESSION_MODE == "cached_db"
+    assert load_settings(
+        monkeypatch, BLOG_CACHE="locmem"
+    ).BLOG_SESSION_MODE == "db", (
+        "Убедитесь, что с кешем в памяти процесса сессии по умолчанию"
+        " хранятся в базе данных."
+    )
+    with pytest.raises(ImproperlyConfigured):
+        load_settings(
+            monkeypatch, BLOG_CACHE="locmem", BLOG_SESSION_MODE="cached_db"
+        )
@@ -0,0 +1,35 @@
+import pytest
+from django.db import connections
+
+from blog.db import SQLITE_PROFILES
+
+pytestmark = [pytest.mark.django_db]
+
+
+def pragmas(*names):
+    connection = connections.create_connection("default")
+    try:
+        with connection.cursor() as cursor:
+            values = []
+            for name in names:
+                cursor.execute(f"PRAGMA {name}")
+                values.append(cursor.fetchone()[0])
+            return values
+    finally:
+        connection.close()
+
+
+def test_production_pragmas_are_applied(settings):
+    settings.BLOG_SQLITE_PROFILE = "production"
+    expected = SQLITE_PROFILES["production"]
+    assert pragmas("busy_timeout", "synchronous", "cache_size") == [
+        expected["busy_timeout"], 1, expected["cache_size"]
+    ], (
+        "Убедитесь, что при подключении к SQLite применяются настройки"
+        " профиля production."
+    )
+
+
+def test_rollback_profile(settings):
+    settings.BLOG_SQLITE_PROFILE = "rollback"
+    assert pragmas("synchronous") == [2]
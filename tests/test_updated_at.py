@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def rewind(post):
+    past = post.updated_at - timedelta(days=1)
+    Post.objects.filter(pk=post.pk).update(updated_at=past)
+    return past
+
+
+def stored_updated_at(post):
+    return Post.objects.values_list("updated_at", flat=True).get(pk=post.pk)
+
+
+def test_save_updates_timestamp(post_with_published_location):
+    post = post_with_published_location
+    past = rewind(post)
+    post.title = "Новый заголовок"
+    post.save()
+    assert stored_updated_at(post) > past, (
+        "Убедитесь, что при сохранении публикации обновляется время её"
+        " изменения."
+    )
+
+
+def test_save_with_update_fields_updates_timestamp(
+        post_with_published_location
+):
+    post = post_with_published_location
+    past = rewind(post)
+    post.title = "Новый заголовок"
+    post.save(update_fields=["title"])
+    assert stored_updated_at(post) > past, (
+        "Убедитесь, что save(update_fields=[...]) обновляет время изменения,"
+        " даже если updated_at не указано в списке полей."
+    )
+
+    past = rewind(post)
+    post.is_published = False
+    post.save(update_fields=("is_published",))
+    assert stored_updated_at(post) > past
+
+
+def test_queryset_updates_timestamp(post_with_published_location):
+    post = post_with_published_location
+    past = rewind(post)
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    assert stored_updated_at(post) > past, (
+        "Убедитесь, что массовое обновление через QuerySet.update() также"
+        " обновляет время изменения."
+    )
+
+    past = rewind(post)
+    post.title = "Другой заголовок"
+    Post.objects.bulk_update([post], ["title"])
+    assert stored_updated_at(post) > past
+
+
+def test_new_comment_updates_post(mixer, post_with_published_location):
+    post = post_with_published_location
+    past = rewind(post)
+    comment = mixer.blend("blog.Comment", post=post)
+    assert comment.updated_at is not None
+    assert stored_updated_at(post) > past